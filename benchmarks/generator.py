@@ -0,0 +1,120 @@
+"""
+Deterministic synthetic career fairs for benchmarks.
+
+Usage: python3 -m benchmarks.generator num_apps data_dir
+
+A fair is fully determined by its FairSpec (including the seed), so the same
+spec yields byte-identical data on every machine. Company popularity follows
+a Zipf-like law: the k-th company (1-based) is chosen with weight 1 / k**skew,
+so a few companies receive most applications, as at a real fair. Each
+student applies to distinct companies, picking one of the company's roles.
+Companies shortlist `shortlist_rate` of their applicants and rank about half
+of those with a priority 1-5.
+"""
+import random
+import sys
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Tuple
+
+from schedule_manager.data_manager import DataManager, Student, Company, JobRole, Application, AppStatus
+
+ROLE_TITLES = ["Software Engineer", "Data Scientist", "DevOps Engineer", "QA Engineer", "Product Manager",
+               "Business Analyst", "UI/UX Engineer", "Machine Learning Engineer"]
+
+
+@dataclass
+class FairSpec:
+    students: int = 1000
+    companies: int = 60
+    roles_per_company: int = 2
+    apps_per_student: int = 5
+    shortlist_rate: float = 0.3
+    skew: float = 1.0  # Zipf exponent of company popularity; 0 is uniform
+    role_minutes: int = 30
+    seed: int = 42
+
+    @property
+    def applications(self) -> int:
+        return self.students * min(self.apps_per_student, self.companies)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def spec_for_apps(num_apps: int, **overrides) -> FairSpec:
+    """A spec with about num_apps applications, ~5 per student and ~60 per company."""
+    apps_per_student = overrides.pop("apps_per_student", 5)
+    return FairSpec(
+        students=max(1, num_apps // apps_per_student),
+        companies=max(apps_per_student + 1, num_apps // 60),
+        apps_per_student=apps_per_student,
+        **overrides,
+    )
+
+
+def _pick_companies(rng: random.Random, cumulative: List[float], k: int) -> List[int]:
+    """k distinct company indices, weighted by popularity."""
+    chosen: List[int] = []
+    seen = set()
+    while len(chosen) < k:
+        c = rng.choices(range(len(cumulative)), cum_weights=cumulative)[0]
+        if c not in seen:
+            seen.add(c)
+            chosen.append(c)
+    return chosen
+
+
+def generate_fair(spec: FairSpec) -> Tuple[List[Student], List[Company]]:
+    rng = random.Random(spec.seed)
+    companies = []
+    for k in range(spec.companies):
+        c_id = f"C{k + 1:05d}"
+        titles = [ROLE_TITLES[(k + j) % len(ROLE_TITLES)] for j in range(spec.roles_per_company)]
+        roles = [JobRole(id=f"{c_id}-R{j + 1}", title=title, company_id=c_id, duration_minutes=spec.role_minutes)
+                 for j, title in enumerate(titles)]
+        companies.append(Company(id=c_id, name=f"Company {k + 1}", job_roles=roles))
+
+    cumulative, total = [], 0.0
+    for k in range(spec.companies):
+        total += 1.0 / (k + 1) ** spec.skew
+        cumulative.append(total)
+
+    per_student = min(spec.apps_per_student, spec.companies)
+    students = []
+    for n in range(spec.students):
+        s_id = f"S{n + 1:06d}"
+        student = Student(id=s_id, name=f"Student {n + 1}", email=f"student{n + 1}@university.edu")
+        for c in _pick_companies(rng, cumulative, per_student):
+            company = companies[c]
+            role = company.job_roles[rng.randrange(len(company.job_roles))]
+            status, priority = AppStatus.APPLIED, None
+            if rng.random() < spec.shortlist_rate:
+                status = AppStatus.SHORTLISTED
+                if rng.random() < 0.5:
+                    priority = rng.randint(1, 5)
+            student.applications.append(Application(
+                student_id=s_id, company_id=company.id, job_role_id=role.id, status=status, priority=priority,
+            ))
+        students.append(student)
+    return students, companies
+
+
+def write_fair(spec: FairSpec, dm: DataManager) -> Tuple[List[Student], List[Company]]:
+    students, companies = generate_fair(spec)
+    dm.save_companies(companies)
+    dm.save_students(students)
+    return students, companies
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__.strip().splitlines()[2])
+        sys.exit(1)
+    spec = spec_for_apps(int(sys.argv[1]))
+    write_fair(spec, DataManager(sys.argv[2]))
+    print(f"Wrote {spec.applications} applications ({spec.students} students, {spec.companies} companies) "
+          f"to {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
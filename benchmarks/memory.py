@@ -0,0 +1,67 @@
+"""
+Measures the memory held by the loaded domain objects.
+
+Usage: python3 -m benchmarks.memory [num_apps]
+
+Writes a synthetic fair (default 100k applications, one interview each) in
+the regular JSON wire format, loads it back through DataManager and reports
+the memory retained by the students and interviews lists (tracemalloc).
+"""
+import json
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.generator import generate_fair, spec_for_apps
+from schedule_manager.data_manager import DataManager
+
+EVENT_START = datetime(2024, 10, 25, 9, 0)
+
+
+def write_schedule(dm: DataManager, students, seed: int = 42):
+    rng = random.Random(seed)
+    rows = []
+    for s in students:
+        for a in s.applications:
+            start = EVENT_START + timedelta(minutes=30 * rng.randrange(16))
+            rows.append({
+                "id": f"INT-{len(rows) + 1}",
+                "student_id": a.student_id,
+                "company_id": a.company_id,
+                "job_role_id": a.job_role_id,
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(minutes=30)).isoformat(),
+            })
+    with open(dm.schedule_file, "w") as f:
+        json.dump(rows, f)
+
+
+def retained_mb(load) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    value = load()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return round((after - before) / 1e6, 1)
+
+
+def main():
+    num_apps = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(tmp)
+        students, _ = generate_fair(spec_for_apps(num_apps))
+        num_apps = sum(len(s.applications) for s in students)
+        dm.save_students(students)
+        write_schedule(dm, students)
+        del students
+
+        print(f"{'dataset':<11} {'objects':>8} {'retained MB':>12}")
+        print(f"{'students':<11} {num_apps:>8} {retained_mb(dm.load_students):>12}")
+        print(f"{'interviews':<11} {num_apps:>8} {retained_mb(dm.load_interviews):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares the CP-SAT model builders in schedule_manager.scheduler.
+
+Usage: python3 -m benchmarks.model_build [num_apps ...]
+
+For each instance size it reports model-build wall time, tracemalloc peak
+during the build, model size (variables / constraints) and solve time.
+"""
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from schedule_manager.scheduler import MODEL_BUILDERS, application_weight
+from schedule_manager.problem import Problem, SolverApp
+from benchmarks.generator import generate_fair, spec_for_apps
+
+NUM_SLOTS = 16
+
+
+def synthetic_apps(num_apps: int, seed: int = 42) -> List[SolverApp]:
+    """A generated fair (see benchmarks.generator) as (student, company, weight) tuples."""
+    students, _ = generate_fair(spec_for_apps(num_apps, seed=seed))
+    return [(a.student_id, a.company_id, application_weight(a)) for s in students for a in s.applications]
+
+
+def measure(builder_name: str, apps: List[SolverApp], solve: bool = True) -> dict:
+    from ortools.sat.python import cp_model
+
+    builder = MODEL_BUILDERS[builder_name]
+    problem = Problem.from_apps(apps, NUM_SLOTS)
+    tracemalloc.start()
+    start = time.perf_counter()
+    model, _, _ = builder(problem)
+    build_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    proto = model.Proto()
+    result = {
+        "builder": builder_name,
+        "apps": len(apps),
+        "build_s": round(build_s, 3),
+        "build_peak_mb": round(peak / 1e6, 1),
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+    }
+    if solve:
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 60
+        start = time.perf_counter()
+        status = solver.Solve(model)
+        result["solve_s"] = round(time.perf_counter() - start, 3)
+        result["status"] = solver.StatusName(status)
+        result["objective"] = solver.ObjectiveValue()
+    return result
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [500, 2000, 10000]
+    print(f"{'builder':<8} {'apps':>7} {'build s':>8} {'peak MB':>8} {'vars':>8} {'cons':>8} {'solve s':>8} {'objective':>10}")
+    for n in sizes:
+        apps = synthetic_apps(n)
+        for name in MODEL_BUILDERS:
+            r = measure(name, apps)
+            print(f"{r['builder']:<8} {r['apps']:>7} {r['build_s']:>8} {r['build_peak_mb']:>8} "
+                  f"{r['variables']:>8} {r['constraints']:>8} {r['solve_s']:>8} {r['objective']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares DataManager storage formats for students.json.
+
+Usage: python3 -m benchmarks.serialization [num_apps ...]
+
+For each instance size and format it reports save time, load time (best of
+3, including Application reconstruction) and file size.
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from benchmarks.generator import generate_fair, spec_for_apps
+from schedule_manager.data_manager import DataManager, Student
+
+FORMATS = [
+    # label, json_format, binary_snapshot
+    ("pretty", "pretty", False),
+    ("compact", "compact", False),
+    ("snapshot", "compact", True),
+]
+
+
+def measure(label: str, json_format: str, binary_snapshot: bool, students: List[Student]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(tmp, json_format=json_format, binary_snapshot=binary_snapshot)
+        start = time.perf_counter()
+        dm.save_students(students)
+        save_s = time.perf_counter() - start
+
+        load_s = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            loaded = dm.load_students()
+            load_s = min(load_s, time.perf_counter() - start)
+        assert sum(len(s.applications) for s in loaded) == sum(len(s.applications) for s in students)
+
+        path = dm.snapshot_path(dm.students_file) if binary_snapshot else dm.students_file
+        return {
+            "format": label,
+            "apps": sum(len(s.applications) for s in students),
+            "save_s": round(save_s, 3),
+            "load_s": round(load_s, 3),
+            "size_mb": round(os.path.getsize(path) / 1e6, 2),
+        }
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f"{'format':<9} {'apps':>7} {'save s':>8} {'load s':>8} {'size MB':>8}")
+    for n in sizes:
+        students, _ = generate_fair(spec_for_apps(n))
+        for label, json_format, binary_snapshot in FORMATS:
+            r = measure(label, json_format, binary_snapshot, students)
+            print(f"{r['format']:<9} {r['apps']:>7} {r['save_s']:>8} {r['load_s']:>8} {r['size_mb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+End-to-end scaling benchmark: generate, load, build, solve, extract, report, export.
+
+Usage: python3 cli.py bench [--tiers 100 1000 ...] [--engine auto] [--compare old.json]
+
+Each tier is a synthetic fair (benchmarks.generator) of about that many
+applications, written to a temporary data directory and scheduled through
+the regular Scheduler, so the phase timings are the ones of a real run (see
+schedule_manager.profiling). Report and export time the HTML reports and
+CSV exports of the resulting schedule. Results go to a JSON file; pass an
+earlier file to --compare to print per-phase ratios against it.
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from benchmarks.generator import spec_for_apps, write_fair
+from schedule_manager.data_manager import DataManager
+from schedule_manager.engines import AUTO
+from schedule_manager.exporting import write_companies_csv, write_students_csv
+from schedule_manager.reporting import render_html_report, render_student_html_report
+from schedule_manager.scheduler import Scheduler, SolverSettings
+
+TIERS = [100, 1000, 10000, 100000]
+EVENT_DATE = "2024-10-25"
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def run_tier(num_apps: int, engine: str = AUTO, settings: Optional[SolverSettings] = None,
+             workers: Optional[int] = None, seed: int = 42) -> Dict[str, Any]:
+    spec = spec_for_apps(num_apps, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        write_fair(spec, DataManager(tmp))
+        generate_s = time.perf_counter() - start
+
+        dm = DataManager(tmp)
+        # The scheduler's progress lines would drown the table
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler = Scheduler(dm)
+            scheduler.run(EVENT_DATE, engine=engine, workers=workers, settings=settings)
+            scheduler.save_results()
+        profiler, info = scheduler.profiler, scheduler.run_info
+        students, companies, interviews = scheduler.students, scheduler.companies, scheduler.interviews
+
+        with profiler.phase("report"):
+            render_html_report(io.StringIO(), interviews, students, companies)
+            render_student_html_report(io.StringIO(), interviews, students, companies)
+        with profiler.phase("export"):
+            students_by_id = {s.id: s for s in students}
+            companies_by_id = {c.id: c for c in companies}
+            write_companies_csv(io.StringIO(), sorted(interviews, key=lambda i: (i.company_id, i.start)),
+                                students_by_id, companies_by_id)
+            write_students_csv(io.StringIO(), sorted(interviews, key=lambda i: (i.student_id, i.start)),
+                               students_by_id, companies_by_id)
+
+    phases: Dict[str, float] = {"generate": round(generate_s, 4)}
+    for p in profiler.phases:
+        phases[p["phase"]] = round(phases.get(p["phase"], 0) + p["wall_s"], 4)
+    return {
+        "tier": num_apps,
+        "applications": info.get("applications"),
+        "spec": spec.to_dict(),
+        "engine": info.get("engine"),
+        "status": info.get("status"),
+        "objective": info.get("objective"),
+        "best_bound": info.get("best_bound"),
+        "interviews": info.get("interviews"),
+        "phases": phases,
+        "engine_stats": profiler.report()["engine"],
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(__file__), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(tiers: List[int], engine: str = AUTO, settings: Optional[SolverSettings] = None,
+              workers: Optional[int] = None, seed: int = 42, output: Optional[str] = None) -> Dict[str, Any]:
+    """Runs every tier, prints a table row per tier and writes the results JSON (returned)."""
+    settings = settings or SolverSettings()
+    suite = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "engine": engine,
+            "seed": seed,
+            "settings": {k: v for k, v in asdict(settings).items() if v is not None},
+        },
+        "results": [],
+    }
+    print(_header())
+    for n in tiers:
+        result = run_tier(n, engine, settings, workers, seed)
+        suite["results"].append(result)
+        print(_row(result))
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(suite, f, indent=2)
+    print(f"Results written to {output}")
+    return suite
+
+
+COLUMNS = ["load", "compile", "solve", "extract", "report", "export"]
+
+
+def _header() -> str:
+    return f"{'apps':>7} {'engine':<7} " + " ".join(f"{c:>8}" for c in COLUMNS) + f" {'objective':>10}"
+
+
+def _row(result: Dict[str, Any]) -> str:
+    phases = result["phases"]
+    return (f"{result['applications']:>7} {result['engine']:<7} "
+            + " ".join(f"{phases.get(c, 0):>8.3f}" for c in COLUMNS) + f" {result['objective']:>10}")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Per tier and phase: baseline seconds, current seconds, current / baseline."""
+    old = {r["tier"]: r for r in baseline["results"]}
+    lines = [f"{'apps':>7} {'phase':<9} {'before s':>9} {'after s':>9} {'ratio':>7}"]
+    for r in current["results"]:
+        base = old.get(r["tier"])
+        if base is None:
+            continue
+        for phase, seconds in r["phases"].items():
+            before = base["phases"].get(phase)
+            if before is None:
+                continue
+            if before:
+                ratio = f"{seconds / before:>6.2f}x"
+            elif seconds:
+                ratio = f"{'inf':>7}"
+            else:  # too fast to time, before and after
+                ratio = f"{'n/a':>7}"
+            lines.append(f"{r['applications']:>7} {phase:<9} {before:>9.3f} {seconds:>9.3f} {ratio}")
+        if base.get("objective") != r.get("objective"):
+            lines.append(f"{r['applications']:>7} objective changed: {base.get('objective')} -> {r.get('objective')}")
+    return lines
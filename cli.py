@@ -1,13 +1,27 @@
+import json
+import os
 import sys
 import argparse
 from pathlib import Path
-from schedule_manager.data_manager import DataManager
-from schedule_manager.scheduler import Scheduler
+from schedule_manager.data_manager import open_data_manager, BACKENDS
+from schedule_manager.scheduler import Scheduler, SolverSettings
+from schedule_manager.engines import AUTO, engine_names
 from schedule_manager.reporting import generate_html_report
 from seed_data import seed
 
+def setting_arg(name):
+    """argparse type for a SolverSettings field, with the same checks as the API."""
+    def parse(text):
+        try:
+            return getattr(SolverSettings.from_dict({name: text}), name)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    return parse
+
 def main():
     parser = argparse.ArgumentParser(description="Interview Scheduling CLI")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="Storage backend (default: $SCHEDULE_BACKEND or json)")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Init Command
@@ -22,24 +36,75 @@ def main():
     prio_parser = subparsers.add_parser("set-priority", help="Set priority for an application")
     prio_parser.add_argument("student_id", help="Student ID (e.g. S001)")
     prio_parser.add_argument("company_id", help="Company ID (e.g. C001)")
-    prio_parser.add_argument("priority", help="Priority (1-5, 1 is highest)")
+    prio_parser.add_argument("priority", help="Priority (1-5, 1 is highest; 'none' clears it)")
+    prio_parser.add_argument("--status", default="", help="Also set the status (e.g. shortlisted)")
+    prio_parser.add_argument("--role", default=None, help="Only the application for this role ID")
+    prio_parser.add_argument("--actor", default=None, help="Name recorded in the audit trail (default: login name)")
+
+    prios_parser = subparsers.add_parser("set-priorities", help="Apply priority/status updates from a CSV")
+    prios_parser.add_argument("file", help="CSV with student_id, company_id, priority, status")
+    prios_parser.add_argument("--actor", default=None, help="Name recorded in the audit trail (default: login name)")
+
+    # Journal Commands
+    subparsers.add_parser("compact", help="Fold journaled application edits into students.json")
+    history_parser = subparsers.add_parser("history", help="Show the audit trail of application edits")
+    history_parser.add_argument("--student", default=None, help="Only edits for this student ID")
     
     # List Command
     list_parser = subparsers.add_parser("list", help="List loaded data")
     list_parser.add_argument("type", choices=["students", "companies"], help="Type of data to list")
     
     # Schedule Command
-    subparsers.add_parser("schedule", help="Run the scheduling algorithm")
+    schedule_parser = subparsers.add_parser("schedule", help="Run the scheduling algorithm")
+    schedule_parser.add_argument("--engine", choices=[AUTO] + engine_names(), default=AUTO,
+                                 help="auto (pick from instance statistics, default), cp-sat (OR-Tools), "
+                                      "flow (min-cost flow + edge colouring, no OR-Tools) "
+                                      "or greedy (heuristic local search, no OR-Tools)")
+    schedule_parser.add_argument("--workers", type=int, default=None,
+                                 help="Processes used to solve independent components (default: all cores)")
+    schedule_parser.add_argument("--warm-start", action="store_true",
+                                 help="Start CP-SAT or greedy from the previously saved schedule")
+    schedule_parser.add_argument("--formulation", choices=["compact", "classic"], default="compact",
+                                 help="CP-SAT model builder (default: compact)")
+    schedule_parser.add_argument("--max-time", type=setting_arg("max_time_in_seconds"), default=None,
+                                 help="CP-SAT wall-clock budget in seconds for the whole run")
+    schedule_parser.add_argument("--search-workers", type=setting_arg("num_search_workers"), default=None,
+                                 help="CP-SAT search workers per solve")
+    schedule_parser.add_argument("--gap-limit", type=setting_arg("relative_gap_limit"), default=None,
+                                 help="Stop once the relative optimality gap is below this (e.g. 0.01)")
+    schedule_parser.add_argument("--seed", type=int, default=None, help="CP-SAT random seed")
+    schedule_parser.add_argument("--profile", action="store_true",
+                                 help="Also record the tracemalloc memory peak of each phase (slower)")
+    schedule_parser.add_argument("--no-cache", action="store_true",
+                                 help="Re-solve even if the same input was solved before")
     
+    # Benchmark Command
+    bench_parser = subparsers.add_parser("bench", help="Time every phase on synthetic fairs of growing size")
+    bench_parser.add_argument("--tiers", type=int, nargs="+", default=None,
+                              help="Approximate application counts (default: 100 1000 10000 100000)")
+    bench_parser.add_argument("--engine", choices=[AUTO] + engine_names(), default=AUTO)
+    bench_parser.add_argument("--workers", type=int, default=None,
+                              help="Processes used to solve independent components (default: all cores)")
+    bench_parser.add_argument("--max-time", type=setting_arg("max_time_in_seconds"), default=None, help="Solver budget per tier in seconds")
+    bench_parser.add_argument("--seed", type=int, default=42, help="Generator seed")
+    bench_parser.add_argument("--output", default=None,
+                              help="Results JSON (default: benchmarks/results/bench-<timestamp>.json)")
+    bench_parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against")
+
     # Export Command
     subparsers.add_parser("export", help="Export schedule to HTML")
 
     parser_import_resp = subparsers.add_parser("import-responses", help="Import from Google Forms Responses CSV")
     parser_import_resp.add_argument("file", help="Path to CSV file")
 
+    subparsers.add_parser("migrate-sqlite", help="Copy the JSON data files into the SQLite backend")
+
     args = parser.parse_args()
     
-    dm = DataManager()
+    if args.backend:
+        # Also picked up by seed() and anything else that opens the store
+        os.environ["SCHEDULE_BACKEND"] = args.backend
+    dm = open_data_manager()
     
     if args.command == "init":
         print("Initializing data...")
@@ -67,29 +132,73 @@ def main():
             for c in companies:
                 print(f"- {c.name} ({len(c.job_roles)} roles)")
                 
+    elif args.command == "set-priority":
+        from schedule_manager.csv_importer import parse_update
+        try:
+            update = parse_update(args.student_id, args.company_id, args.priority, args.status)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        update.job_role_id = args.role
+        changed, unmatched = dm.update_applications([update], actor=args.actor)
+        if unmatched:
+            print(f"No application from {args.student_id} to {args.company_id} found.")
+            sys.exit(1)
+        print(f"Updated {changed} application(s) of {args.student_id} to {args.company_id}.")
+
+    elif args.command == "set-priorities":
+        from schedule_manager.csv_importer import CSVImporter
+        CSVImporter(dm).import_priority_updates(args.file, actor=args.actor)
+
+    elif args.command == "compact":
+        folded = dm.compact()
+        print(f"Compacted {folded} journaled edit(s) into the student data.")
+
+    elif args.command == "history":
+        for r in dm.history(args.student):
+            changes = []
+            if r.get("priority") is not None or r.get("clear_priority"):
+                changes.append(f"priority={r.get('priority')}")
+            if r.get("status"):
+                changes.append(f"status={r['status']}")
+            target = r["company_id"] + (f"/{r['job_role_id']}" if r.get("job_role_id") else "")
+            print(f"{r.get('ts', '?')}  {r.get('actor', '?'):<12} {r['student_id']} -> {target}: {', '.join(changes)}")
+
     elif args.command == "schedule":
-        scheduler = Scheduler(dm)
+        scheduler = Scheduler(dm, profile_memory=args.profile)
+        settings = SolverSettings(
+            max_time_in_seconds=args.max_time,
+            num_search_workers=args.search_workers,
+            relative_gap_limit=args.gap_limit,
+            random_seed=args.seed,
+        )
         # Use today's date or specific date?
-        interviews = scheduler.run(event_date="2024-10-25")
-        
-        # Save interviews back to disk (Scheduler implementation didn't have save, lets just output count)
-        # In a real app we'd save the interviews to JSON. 
-        # For this prototype, we will just print success.
-        # We need to save them to generate report later.
-        
-        # Let's save interviews just for this session flow
-        # We need to add save_interviews to DataManager or just pass them to export
-        # But CLI commands are improved by state.
-        # Let's simple write to a temp file or just run schedule AND export in one go for simplicity?
-        # Actually proper way: add save_interviews to DataManager.
-        
-        # Quick fix: Add save support here manually or update implementation.
-        # I'll update DataManager in next edit if needed, but for now I'll just save to 'data/schedule.json' manually here.
-        import json
-        from dataclasses import asdict
-        with open("schedule_manager/data/schedule.json", "w") as f:
-            json.dump([asdict(i) for i in interviews], f, indent=2)
-        print("Schedule saved to data/schedule.json")
+        try:
+            scheduler.run(event_date="2024-10-25", engine=args.engine, workers=args.workers,
+                          warm_start=args.warm_start, formulation=args.formulation,
+                          settings=settings, use_cache=not args.no_cache)
+        except RuntimeError as e:
+            # The solve failed; keep the saved schedule
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        if not scheduler.run_info:
+            # run() bailed out (engine unavailable); keep the saved schedule
+            sys.exit(1)
+
+        scheduler.save_results()
+        print(f"Schedule saved to {dm.schedule_file}")
+        print("Profile (also in data/schedule_profile.json):")
+        print(scheduler.profiler.summary())
+
+    elif args.command == "bench":
+        from benchmarks.suite import TIERS, compare, run_suite
+        suite = run_suite(args.tiers or TIERS, engine=args.engine,
+                          settings=SolverSettings(max_time_in_seconds=args.max_time),
+                          workers=args.workers, seed=args.seed, output=args.output)
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            print("\n".join(compare(suite, baseline)))
 
     elif args.command == "export":
         # Load data
@@ -97,29 +206,22 @@ def main():
         companies = dm.load_companies()
         
         # Load schedule
-        schedule_path = Path("schedule_manager/data/schedule.json")
-        if not schedule_path.exists():
+        if not dm.schedule_file.exists():
             print("No schedule found. Run 'python3 cli.py schedule' first.")
             return
             
-        import json
-        from schedule_manager.data_manager import Interview
-        with open(schedule_path, "r") as f:
-            data = json.load(f)
-            interviews = [Interview(**i) for i in data]
+        interviews = dm.load_interviews()
             
-        from schedule_manager.reporting import generate_html_report, generate_student_html_report
+        from schedule_manager.reporting import render_html_report, render_student_html_report
         
-        # Company Report
-        html_company = generate_html_report(interviews, students, companies)
+        # Company Report (streamed straight to disk)
         with open("schedule_companies.html", "w") as f:
-            f.write(html_company)
+            render_html_report(f, interviews, students, companies)
         print("Report generated: schedule_companies.html")
         
         # Student Report
-        html_student = generate_student_html_report(interviews, students, companies)
         with open("schedule_students.html", "w") as f:
-            f.write(html_student)
+            render_student_html_report(f, interviews, students, companies)
         print("Report generated: schedule_students.html")
 
     elif args.command == "import-responses":
@@ -128,6 +230,13 @@ def main():
         importer.import_responses(args.file)
         print(f"Successfully imported responses from {args.file}")
 
+    elif args.command == "migrate-sqlite":
+        from schedule_manager.sqlite_store import migrate_from_json
+        store = migrate_from_json()
+        print(f"Migrated {len(store.load_students())} students, {len(store.load_companies())} companies "
+              f"and {len(store.load_interviews())} interviews to {store.db_file}")
+        print("Use it with --backend sqlite or SCHEDULE_BACKEND=sqlite.")
+
     else:
         parser.print_help()
 
@@ -1,7 +1,7 @@
 import csv
 from pathlib import Path
-from typing import List
-from schedule_manager.data_manager import DataManager, Student, Company, JobRole, Application, AppStatus
+from typing import List, Optional
+from schedule_manager.data_manager import DataManager, Student, Company, JobRole, Application, AppStatus, ApplicationUpdate
 
 class CSVImporter:
     def __init__(self, data_manager: DataManager):
@@ -115,3 +115,45 @@ class CSVImporter:
         self.dm.save_students(list(student_map.values()))
         print(f"Imported {count} applications from {csv_path}")
 
+    def import_priority_updates(self, csv_path: str, actor: Optional[str] = None) -> int:
+        """
+        Expects CSV with headers: student_id, company_id, priority, status
+        (priority and status may be blank to leave them unchanged; priority
+        "none" clears it). All rows are applied in one load/save cycle.
+        """
+        updates = []
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for line, row in enumerate(reader, start=2):
+                try:
+                    update = parse_update(row['student_id'], row['company_id'],
+                                          row.get('priority', ''), row.get('status', ''))
+                except ValueError as e:
+                    print(f"Warning: line {line}: {e}. Skipping.")
+                    continue
+                updates.append(update)
+
+        changed, unmatched = self.dm.update_applications(updates, actor=actor)
+        for u in unmatched:
+            print(f"Warning: No application from {u.student_id} to {u.company_id}. Skipping.")
+        print(f"Updated {changed} applications from {csv_path}")
+        return changed
+
+
+def parse_update(student_id: str, company_id: str, priority: str = '', status: str = '') -> ApplicationUpdate:
+    """Builds an ApplicationUpdate from CLI/CSV strings, raising ValueError on bad input."""
+    update = ApplicationUpdate(student_id=student_id.strip(), company_id=company_id.strip())
+    priority = (priority or '').strip().lower()
+    if priority in ('none', 'clear'):
+        update.clear_priority = True
+    elif priority:
+        if not priority.isdigit() or not 1 <= int(priority) <= 5:
+            raise ValueError(f"priority must be 1-5 or 'none', got '{priority}'")
+        update.priority = int(priority)
+    status = (status or '').strip().lower()
+    if status:
+        try:
+            update.status = AppStatus(status)
+        except ValueError:
+            raise ValueError(f"unknown status '{status}'")
+    return update
@@ -1,15 +1,68 @@
+import calendar
 import json
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional
+import os
+import pickle
+from dataclasses import dataclass, field, asdict, fields
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from enum import Enum
 from pathlib import Path
 
+from schedule_manager.ids import IdRegistry
+from schedule_manager.journal import Journal, read_audit_log
+
+JSON_FORMATS = ("pretty", "compact")
+
+# Journaled edits are folded into students.json automatically past this many
+JOURNAL_COMPACT_THRESHOLD = 1000
+
 class AppStatus(str, Enum):
     APPLIED = "applied"
     SHORTLISTED = "shortlisted"
     WAITLISTED = "waitlisted"
     REJECTED = "rejected"
 
+_STATUSES = {s.value: s for s in AppStatus}
+
+
+def slotted(cls):
+    """
+    Rebuilds a dataclass with __slots__ (what dataclass(slots=True) does on
+    Python 3.10+). Without a per-instance __dict__, each object is a few
+    pointers wide - it matters at 100k applications and interviews.
+    """
+    names = tuple(f.name for f in fields(cls))
+    body = {k: v for k, v in cls.__dict__.items() if k not in names and k not in ("__dict__", "__weakref__")}
+    body["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, body)
+
+
+# Interview times are held as epoch seconds of the (naive, event-local) time
+# and converted to ISO strings only when written out. Memoized: a fair has a
+# few dozen distinct slot times, so conversions return shared strings.
+
+@lru_cache(maxsize=4096)
+def iso_to_epoch(iso: str) -> int:
+    return calendar.timegm(datetime.fromisoformat(iso).timetuple())
+
+
+@lru_cache(maxsize=4096)
+def epoch_to_iso(epoch: int) -> str:
+    return (datetime(1970, 1, 1) + timedelta(seconds=epoch)).isoformat()
+
+
+def datetime_to_epoch(dt: datetime) -> int:
+    return calendar.timegm(dt.timetuple())
+
+
+def time_label(epoch: int) -> str:
+    """Epoch seconds -> 'HH:MM'"""
+    seconds = epoch % 86400
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}"
+
+
+@slotted
 @dataclass
 class JobRole:
     id: str
@@ -17,12 +70,14 @@ class JobRole:
     company_id: str
     duration_minutes: int = 30
 
+@slotted
 @dataclass
 class Company:
     id: str
     name: str
     job_roles: List[JobRole] = field(default_factory=list)
 
+@slotted
 @dataclass
 class Application:
     student_id: str
@@ -32,6 +87,7 @@ class Application:
     priority: Optional[int] = None  # 1 (High) to 5 (Low), None if not ranked
     cv_link: str = ""
 
+@slotted
 @dataclass
 class Student:
     id: str
@@ -39,47 +95,211 @@ class Student:
     email: str
     applications: List[Application] = field(default_factory=list)
 
+@slotted
 @dataclass
 class Interview:
     id: str
     student_id: str
     company_id: str
     job_role_id: str
-    start_time: str # ISO format
-    end_time: str   # ISO format
+    start: int  # epoch seconds, see iso_to_epoch
+    end: int
+
+    @property
+    def start_time(self) -> str:  # ISO format
+        return epoch_to_iso(self.start)
+
+    @property
+    def end_time(self) -> str:  # ISO format
+        return epoch_to_iso(self.end)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The JSON wire format (ISO start_time/end_time)."""
+        return {
+            "id": self.id,
+            "student_id": self.student_id,
+            "company_id": self.company_id,
+            "job_role_id": self.job_role_id,
+            "start_time": epoch_to_iso(self.start),
+            "end_time": epoch_to_iso(self.end),
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Interview":
+        return cls(d["id"], d["student_id"], d["company_id"], d["job_role_id"],
+                   iso_to_epoch(d["start_time"]), iso_to_epoch(d["end_time"]))
     
+@dataclass
+class ApplicationUpdate:
+    """A change to the application(s) of one student to one company (optionally one role)."""
+    student_id: str
+    company_id: str
+    priority: Optional[int] = None
+    status: Optional[AppStatus] = None
+    job_role_id: Optional[str] = None
+    clear_priority: bool = False  # set priority back to None
+
+    def matches(self, app: "Application") -> bool:
+        return not self.job_role_id or app.job_role_id == self.job_role_id
+
+    def apply(self, app: "Application"):
+        if self.status is not None:
+            app.status = AppStatus(self.status)
+        if self.priority is not None or self.clear_priority:
+            app.priority = self.priority
+
+    def to_record(self) -> Dict:
+        record = asdict(self)
+        if self.status is not None:
+            record["status"] = AppStatus(self.status).value
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict) -> "ApplicationUpdate":
+        return cls(**{k: record.get(k) for k in ("student_id", "company_id", "priority", "status", "job_role_id")},
+                   clear_priority=bool(record.get("clear_priority")))
+
 class DataManager:
-    def __init__(self, data_dir: str = "schedule_manager/data"):
+    def __init__(self, data_dir: str = "schedule_manager/data", json_format: str = "pretty",
+                 binary_snapshot: bool = False):
+        """
+        json_format: "pretty" (indented, one object per application) or
+            "compact" (no whitespace, applications stored as column arrays).
+            Either format is read back regardless of this setting.
+        binary_snapshot: also write a pickle snapshot next to each data file,
+            which loads are served from while it is newer than the JSON.
+        """
+        if json_format not in JSON_FORMATS:
+            raise ValueError(f"Unknown JSON format '{json_format}'. Choose from: {', '.join(JSON_FORMATS)}")
+        self.json_format = json_format
+        self.binary_snapshot = binary_snapshot
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.students_file = self.data_dir / "students.json"
         self.companies_file = self.data_dir / "companies.json"
-        
-    def _save(self, path: Path, data: List[Dict]):
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self.schedule_file = self.data_dir / "schedule.json"
+        # Sidecar with solver settings and outcome of the run that produced schedule.json
+        self.schedule_meta_file = self.data_dir / "schedule_meta.json"
+        # Best schedule found so far by a running (or the last) solve
+        self.best_schedule_file = self.data_dir / "schedule.best.json"
+        # Per-phase timings/memory and engine statistics of that run
+        self.profile_file = self.data_dir / "schedule_profile.json"
+        # Per-component solutions of the saved schedule, for incremental re-solves
+        self.components_file = self.data_dir / "schedule_components.json"
+        # Application edits since students.json was last written, and the
+        # compacted history of all earlier edits
+        self.journal_file = self.data_dir / "students.journal"
+        self.audit_file = self.data_dir / "students.audit.jsonl"
+        self.journal = Journal(self.journal_file)
+        # Dense int IDs for everything loaded through this manager
+        self.ids = IdRegistry()
+
+    @staticmethod
+    def snapshot_path(path: Path) -> Path:
+        return path.with_suffix(".pkl")
+
+    @staticmethod
+    def _replace(path: Path, mode: str, write: Callable):
+        # Write to a temp file and rename, so concurrent readers (the web
+        # server's repository) never see a half-written file
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, mode) as f:
+            write(f)
+        os.replace(tmp, path)
 
-    def _load(self, path: Path) -> List[Dict]:
+    def _save(self, path: Path, data: Any, snapshot: Any = None):
+        if self.json_format == "compact":
+            self._replace(path, 'w', lambda f: json.dump(data, f, separators=(',', ':')))
+        else:
+            self._replace(path, 'w', lambda f: json.dump(data, f, indent=2))
+        if self.binary_snapshot and snapshot is not None:
+            # Written after the JSON, so it is the newer file
+            self._replace(self.snapshot_path(path), 'wb', lambda f: pickle.dump(snapshot, f, protocol=5))
+
+    def _load(self, path: Path) -> Any:
+        snap = self.snapshot_path(path)
+        try:
+            if snap.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                with open(snap, 'rb') as f:
+                    return pickle.load(f)
+        except FileNotFoundError:
+            pass
         if not path.exists():
             return []
         with open(path, 'r') as f:
             return json.load(f)
 
     def save_students(self, students: List[Student]):
-        self._save(self.students_file, [asdict(s) for s in students])
+        columns = _student_columns(students)
+        data = columns if self.json_format == "compact" else [asdict(s) for s in students]
+        self._save(self.students_file, data, snapshot=columns)
+        # The snapshot now contains every journaled edit. If we crash before
+        # the journal is archived, replaying it again is harmless: each record
+        # sets absolute values.
+        self.journal.archive_to(self.audit_file)
 
     def load_students(self) -> List[Student]:
         data = self._load(self.students_file)
-        students = []
-        for s_data in data:
-            # Reconstruct Application objects
-            apps = [Application(**a) for a in s_data.get("applications", [])]
-            s_data["applications"] = apps
-            students.append(Student(**s_data))
+        if isinstance(data, dict):
+            students = _students_from_columns(data)
+        else:
+            students = []
+            for s_data in data:
+                # Reconstruct Application objects (status as the shared enum member)
+                apps = []
+                for a in s_data.get("applications", []):
+                    if "status" in a:
+                        a["status"] = _STATUSES[a["status"]]
+                    apps.append(Application(**a))
+                s_data["applications"] = apps
+                students.append(Student(**s_data))
+        records = self.journal.read()
+        if records:
+            _apply_updates(students, [ApplicationUpdate.from_record(r) for r in records])
+        self.ids.add_students(students)
         return students
 
+    def update_applications(self, updates: List[ApplicationUpdate],
+                            actor: Optional[str] = None) -> Tuple[int, List[ApplicationUpdate]]:
+        """
+        Records the updates in the journal instead of rewriting students.json.
+        Returns (applications changed, updates that matched nothing); only
+        matching updates are journaled.
+        """
+        students = self.load_students()
+        changed, unmatched = _apply_updates(students, updates)
+        unmatched_ids = {id(u) for u in unmatched}
+        self.journal.append((u.to_record() for u in updates if id(u) not in unmatched_ids), actor=actor)
+        if len(self.journal) >= JOURNAL_COMPACT_THRESHOLD:
+            self.save_students(students)
+        return changed, unmatched
+
+    def update_application(self, student_id: str, company_id: str, job_role_id: Optional[str] = None,
+                           status: Optional[AppStatus] = None, priority: Optional[int] = None,
+                           clear_priority: bool = False, actor: Optional[str] = None) -> int:
+        """Updates one student's application(s) to a company. Returns the number changed."""
+        changed, _ = self.update_applications([ApplicationUpdate(
+            student_id, company_id, priority=priority, status=status,
+            job_role_id=job_role_id, clear_priority=clear_priority)], actor=actor)
+        return changed
+
+    def compact(self) -> int:
+        """Folds the journal into students.json. Returns the number of records folded."""
+        pending = len(self.journal.read())
+        if pending:
+            self.save_students(self.load_students())
+        return pending
+
+    def history(self, student_id: Optional[str] = None) -> List[Dict]:
+        """All application edits, oldest first: compacted ones, then pending ones."""
+        records = read_audit_log(self.audit_file) + self.journal.read()
+        if student_id:
+            records = [r for r in records if r.get("student_id") == student_id]
+        return records
+
     def save_companies(self, companies: List[Company]):
-        self._save(self.companies_file, [asdict(c) for c in companies])
+        data = [asdict(c) for c in companies]
+        self._save(self.companies_file, data, snapshot=data)
 
     def load_companies(self) -> List[Company]:
         data = self._load(self.companies_file)
@@ -89,4 +309,129 @@ class DataManager:
             roles = [JobRole(**r) for r in c_data.get("job_roles", [])]
             c_data["job_roles"] = roles
             companies.append(Company(**c_data))
+        self.ids.add_companies(companies)
         return companies
+
+    def save_interviews(self, interviews: List[Interview]):
+        data = [i.to_dict() for i in interviews]
+        self._save(self.schedule_file, data, snapshot=data)
+
+    def load_interviews(self) -> List[Interview]:
+        interviews = [Interview.from_dict(i) for i in self._load(self.schedule_file)]
+        self.ids.add_interviews(interviews)
+        return interviews
+
+    def save_schedule_meta(self, meta: Dict):
+        self._save(self.schedule_meta_file, meta)
+
+    def load_schedule_meta(self) -> Dict:
+        if not self.schedule_meta_file.exists():
+            return {}
+        with open(self.schedule_meta_file, 'r') as f:
+            return json.load(f)
+
+    def save_profile(self, profile: Dict):
+        self._save(self.profile_file, profile)
+
+    def load_profile(self) -> Dict:
+        if not self.profile_file.exists():
+            return {}
+        with open(self.profile_file, 'r') as f:
+            return json.load(f)
+
+    def save_component_solutions(self, components: Dict):
+        """Component hash -> solution (see decomposition.ComponentMemo)."""
+        self._replace(self.components_file, 'w', lambda f: json.dump(components, f, separators=(',', ':')))
+
+    def load_component_solutions(self) -> Dict:
+        if not self.components_file.exists():
+            return {}
+        with open(self.components_file, 'r') as f:
+            return json.load(f)
+
+    def save_best_schedule(self, best: Dict):
+        """Objective, bound, gap, wall time and interviews (wire format) of the best solution so far."""
+        self._replace(self.best_schedule_file, 'w', lambda f: json.dump(best, f, separators=(',', ':')))
+
+    def load_best_schedule(self) -> Dict:
+        if not self.best_schedule_file.exists():
+            return {}
+        with open(self.best_schedule_file, 'r') as f:
+            return json.load(f)
+
+
+def _student_columns(students: List[Student]) -> Dict[str, Any]:
+    """Column-oriented form of the students file: one array per field."""
+    apps = [a for s in students for a in s.applications]
+    return {
+        "format": "columns",
+        "students": {
+            "id": [s.id for s in students],
+            "name": [s.name for s in students],
+            "email": [s.email for s in students],
+        },
+        "applications": {
+            "student_id": [a.student_id for a in apps],
+            "company_id": [a.company_id for a in apps],
+            "job_role_id": [a.job_role_id for a in apps],
+            "status": [AppStatus(a.status).value for a in apps],
+            "priority": [a.priority for a in apps],
+            "cv_link": [a.cv_link for a in apps],
+        },
+    }
+
+
+def _students_from_columns(data: Dict[str, Any]) -> List[Student]:
+    cols = data["students"]
+    students = [Student(sid, name, email) for sid, name, email in zip(cols["id"], cols["name"], cols["email"])]
+    by_id = {s.id: s for s in students}
+    cols = data["applications"]
+    for app in map(Application, cols["student_id"], cols["company_id"], cols["job_role_id"],
+                   map(_STATUSES.__getitem__, cols["status"]), cols["priority"], cols["cv_link"]):
+        student = by_id.get(app.student_id)
+        if student is not None:
+            student.applications.append(app)
+    return students
+
+
+def _apply_updates(students: List[Student],
+                   updates: List[ApplicationUpdate]) -> Tuple[int, List[ApplicationUpdate]]:
+    """Applies updates in place via a (student_id, company_id) index."""
+    index: Dict[Tuple[str, str], List[Application]] = {}
+    for s in students:
+        for app in s.applications:
+            index.setdefault((app.student_id, app.company_id), []).append(app)
+
+    changed = 0
+    unmatched = []
+    for update in updates:
+        apps = [a for a in index.get((update.student_id, update.company_id), []) if update.matches(a)]
+        if not apps:
+            unmatched.append(update)
+            continue
+        for app in apps:
+            update.apply(app)
+        changed += len(apps)
+    return changed, unmatched
+
+
+BACKENDS = ("json", "sqlite")
+
+def open_data_manager(data_dir: str = "schedule_manager/data", backend: Optional[str] = None):
+    """
+    Returns the storage backend selected by `backend` or the SCHEDULE_BACKEND
+    environment variable: "json" (default, DataManager) or "sqlite"
+    (sqlite_store.SQLiteDataManager). Both expose the same load/save methods.
+
+    The JSON backend also reads SCHEDULE_JSON_FORMAT ("pretty" or "compact")
+    and SCHEDULE_SNAPSHOT=1 (write binary snapshots).
+    """
+    backend = backend or os.environ.get("SCHEDULE_BACKEND", "json")
+    if backend == "sqlite":
+        from schedule_manager.sqlite_store import SQLiteDataManager
+        return SQLiteDataManager(data_dir)
+    if backend != "json":
+        raise ValueError(f"Unknown storage backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    return DataManager(data_dir,
+                       json_format=os.environ.get("SCHEDULE_JSON_FORMAT", "pretty"),
+                       binary_snapshot=os.environ.get("SCHEDULE_SNAPSHOT", "") not in ("", "0"))
@@ -0,0 +1,314 @@
+"""
+Splits the application graph into independent connected components.
+
+Two applications interact only if they share a student or a company, so every
+connected component of the student-company graph can be scheduled on its own
+(each component gets the full slot grid). Components are solved in a process
+pool and their assignments merged back into global application indices.
+
+With a ComponentMemo, components whose subproblem is unchanged since the
+last run (same hash) take their previous solution instead of being solved,
+so a small edit only re-solves the components it touches.
+"""
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing.managers import BaseProxy
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from schedule_manager.problem import Problem
+
+
+@dataclass
+class SolveResult:
+    """Outcome of solving one (sub)problem."""
+    assignment: Dict[int, int] = field(default_factory=dict)  # app index -> slot index
+    objective: float = 0.0
+    best_bound: float = 0.0  # proven upper bound on the objective
+    status: str = "OPTIMAL"  # "OPTIMAL" or "FEASIBLE"
+    # Engine counters (model size, search statistics, phase seconds), summed over components
+    stats: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def gap(self) -> float:
+        """Relative optimality gap, as CP-SAT's relative_gap_limit measures it."""
+        return abs(self.best_bound - self.objective) / max(1.0, abs(self.best_bound))
+
+
+# Called with each improving solution an engine finds (status "FEASIBLE",
+# best_bound the engine's bound at that moment)
+SolutionFn = Callable[[SolveResult], None]
+
+# Engine entry point: (problem, hints, fixed, on_solution) -> SolveResult, or None if no solution
+# hints maps app index -> suggested slot (e.g. from the previous schedule)
+# fixed is the set of app indices that must be scheduled (see presolve.py)
+SolveFn = Callable[[Problem, Optional[Dict[int, int]], Optional[Set[int]], Optional[SolutionFn]],
+                   Optional[SolveResult]]
+
+# Progress report: (best solution so far over global app indices, components finished)
+ProgressFn = Callable[[SolveResult, int], None]
+
+# Minimum seconds between two progress reports
+PROGRESS_INTERVAL = 0.25
+
+
+@dataclass
+class ComponentMemo:
+    """
+    Solutions of the previous run's components by subproblem hash.
+
+    A component's hash covers `context` (slot grid, engine, settings), the
+    canonical line of each of its applications (`lines`, indexed like the
+    problem) in order and which of them presolve fixed. Equal hashes mean the
+    same subproblem with the same local indices, so the old local assignment
+    applies as is. solve_components fills `current` with this run's
+    solutions, to be saved for the next run.
+    """
+    context: str
+    lines: Sequence[str]
+    previous: Dict[str, SolveResult] = field(default_factory=dict)
+    current: Dict[str, SolveResult] = field(default_factory=dict)
+    reused: int = 0
+
+    def key(self, comp: List[int], local_fixed: Optional[Set[int]]) -> str:
+        h = hashlib.sha256(self.context.encode())
+        h.update("".join(self.lines[i] for i in comp).encode())
+        h.update(repr(sorted(local_fixed or ())).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def load(data: Dict[str, Any]) -> Dict[str, SolveResult]:
+        """Previous solutions from their saved form (see to_dict)."""
+        return {key: SolveResult({k: t for k, t in r["assignment"]}, r["objective"], r["best_bound"], r["status"])
+                for key, r in data.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: {"assignment": sorted(r.assignment.items()), "objective": r.objective,
+                      "best_bound": r.best_bound, "status": r.status}
+                for key, r in self.current.items()}
+
+
+def connected_components(problem: Problem) -> List[List[int]]:
+    """Groups application indices by connected component, largest first."""
+    # Largest first so the pool starts on the expensive work
+    return sorted(problem.components(), key=len, reverse=True)
+
+
+SubProblem = Tuple[Problem, Optional[Dict[int, int]], Optional[Set[int]]]
+
+
+@contextmanager
+def _shared_stop(stop):
+    """
+    An Event pool workers can poll that follows `stop`. A plain
+    threading.Event cannot be pickled, so it is relayed to one from a
+    Manager; a Manager Event is used as is.
+    """
+    if isinstance(stop, BaseProxy):
+        yield stop
+        return
+    with multiprocessing.Manager() as manager:
+        shared = manager.Event()
+        finished = threading.Event()
+
+        def relay():
+            while not finished.is_set():
+                if stop.wait(0.2):
+                    shared.set()
+                    return
+
+        thread = threading.Thread(target=relay, daemon=True)
+        thread.start()
+        try:
+            yield shared
+        finally:
+            finished.set()
+            thread.join()
+
+
+def _solve_batch(solve_fn: SolveFn, batch: List[SubProblem]) -> List[Optional[SolveResult]]:
+    return [solve_fn(problem, hints, fixed, None) for problem, hints, fixed in batch]
+
+
+class _RunningMerge:
+    """
+    Per-component results merged over global app indices, kept up to date
+    as they are replaced. A component without a result adds its total
+    weight to the bound.
+
+    Replacing one component's result only touches that component's
+    applications, so reporting progress after every improving solution does
+    not re-merge the whole problem.
+    """
+
+    def __init__(self, problem: Problem, components: List[List[int]], results: List[Optional[SolveResult]]):
+        self.components = components
+        self.results = results
+        self.totals = [sum(problem.weight[i] for i in comp) for comp in components]
+        self.open = 0  # components without an OPTIMAL result
+        self.best = SolveResult()
+        for k in range(len(components)):
+            self._add(k, 1)
+        self._update_status()
+
+    def _add(self, k: int, sign: int):
+        result, comp, best = self.results[k], self.components[k], self.best
+        if result is None:
+            best.best_bound += sign * self.totals[k]
+            self.open += sign
+            return
+        if sign > 0:
+            for local_i, t in result.assignment.items():
+                best.assignment[comp[local_i]] = t
+        else:
+            for local_i in result.assignment:
+                del best.assignment[comp[local_i]]
+        best.objective += sign * result.objective
+        best.best_bound += sign * result.best_bound
+        for key, value in result.stats.items():
+            best.stats[key] = best.stats.get(key, 0) + sign * value
+        if result.status != "OPTIMAL":
+            self.open += sign
+
+    def _update_status(self):
+        self.best.status = "OPTIMAL" if self.open == 0 else "FEASIBLE"
+
+    def set(self, k: int, result: Optional[SolveResult]):
+        self._add(k, -1)
+        self.results[k] = result
+        self._add(k, 1)
+        self._update_status()
+
+
+def solve_components(solve_fn: SolveFn, problem: Problem,
+                     max_workers: Optional[int] = None,
+                     hints: Optional[Dict[int, int]] = None,
+                     fixed: Optional[Set[int]] = None,
+                     on_progress: Optional[ProgressFn] = None,
+                     stop=None, memo: Optional[ComponentMemo] = None,
+                     fallback_fn: Optional[SolveFn] = None,
+                     progress_interval: float = PROGRESS_INTERVAL,
+                     pass_stop: bool = False) -> Tuple[SolveResult, int]:
+    """
+    Solves every component with `solve_fn` and merges the results.
+    Returns (merged SolveResult over global app indices, number of components).
+
+    `solve_fn` must be a module-level function so it can be pickled.
+    `hints` (global app index -> slot) and `fixed` (global app indices) are
+    re-indexed per component.
+    `on_progress` receives the best merged solution so far: after improving
+    solutions when solving inline, after batches in the pool, at most once
+    every `progress_interval` seconds. The SolveResult it gets is updated in
+    place as the search goes on; copy it to keep it.
+    `stop` (an Event) ends the search once it is set. With `pass_stop`,
+    solve_fn also gets it as its "stop" keyword to cut the running search
+    short; in the pool that is a Manager Event following `stop`, so `stop`
+    itself never has to be pickled.
+    Every component still without a solution afterwards (not started
+    before `stop`, or the engine found none) is solved with `fallback_fn`
+    (default `solve_fn`), which should be fast; if that finds none either,
+    RuntimeError is raised rather than a partial schedule returned.
+    `memo` supplies previous solutions of unchanged components (which are
+    not solved again) and collects this run's solutions in memo.current.
+    """
+    components = connected_components(problem)
+
+    sub_problems: List[SubProblem] = []
+    for comp in components:
+        local_hints = None
+        if hints:
+            local_hints = {k: hints[i] for k, i in enumerate(comp) if i in hints}
+        local_fixed = None
+        if fixed:
+            local_fixed = {k for k, i in enumerate(comp) if i in fixed}
+        sub_problems.append((problem.subproblem(comp), local_hints, local_fixed))
+
+    results: List[Optional[SolveResult]] = [None] * len(components)
+    keys: List[Optional[str]] = [None] * len(components)
+    if memo is not None:
+        for k, comp in enumerate(components):
+            keys[k] = memo.key(comp, sub_problems[k][2])
+            results[k] = memo.previous.get(keys[k])
+        memo.reused = sum(r is not None for r in results)
+    todo = [k for k in range(len(components)) if results[k] is None]
+    merged = _RunningMerge(problem, components, results)
+    last_report = [float("-inf")]
+    unreported = [False]
+
+    def report(components_done: int, force: bool = False):
+        unreported[0] = True
+        if on_progress and (force or time.monotonic() - last_report[0] >= progress_interval):
+            on_progress(merged.best, components_done)
+            last_report[0] = time.monotonic()
+            unreported[0] = False
+
+    if memo is not None and memo.reused:
+        report(memo.reused)
+
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, len(todo))
+    stoppable = pass_stop and stop is not None
+    local_fn = partial(solve_fn, stop=stop) if stoppable else solve_fn
+    if workers <= 1:
+        for n, k in enumerate(todo):
+            sub_problem, sub_hints, sub_fixed = sub_problems[k]
+            if stop is not None and stop.is_set():
+                break
+            on_solution = None
+            if on_progress:
+                def on_solution(solution: SolveResult, k=k, done=len(components) - len(todo) + n):
+                    merged.set(k, solution)
+                    report(done)
+            merged.set(k, local_fn(sub_problem, sub_hints, sub_fixed, on_solution))
+            report(len(components) - len(todo) + n + 1)
+    else:
+        # Spread components over a few batches per worker (balanced by size),
+        # so thousands of tiny components don't pay one round-trip each.
+        num_batches = min(len(todo), workers * 4)
+        batches: List[List[int]] = [[] for _ in range(num_batches)]
+        loads = [0] * num_batches
+        for k in todo:
+            b = loads.index(min(loads))
+            batches[b].append(k)
+            loads[b] += len(components[k])
+
+        with (_shared_stop(stop) if stoppable else nullcontext()) as worker_stop, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            worker_fn = partial(solve_fn, stop=worker_stop) if stoppable else solve_fn
+            futures = {
+                pool.submit(_solve_batch, worker_fn, [sub_problems[k] for k in batch]): batch
+                for batch in batches if batch
+            }
+            done_components = len(components) - len(todo)
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                batch = futures[future]
+                for k, result in zip(batch, future.result()):
+                    merged.set(k, result)
+                done_components += len(batch)
+                report(done_components)
+                if stop is not None and stop.is_set():
+                    for pending in futures:
+                        pending.cancel()
+
+    # Components left without a solution: not started before stop, or the engine found none
+    for k in todo:
+        if results[k] is None:
+            merged.set(k, (fallback_fn or local_fn)(*sub_problems[k], None))
+            unreported[0] = True
+            if results[k] is None:
+                raise RuntimeError(f"No solution found for a component of {len(components[k])} applications.")
+    if unreported[0]:
+        # The last state may have been throttled away
+        report(len(components), force=True)
+
+    if memo is not None:
+        memo.current = dict(zip(keys, results))
+    return merged.best, len(components)
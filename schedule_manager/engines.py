@@ -0,0 +1,87 @@
+"""
+Scheduling engine registry and automatic engine selection.
+
+An engine is a module-level solve function over a Problem (see
+decomposition.SolveFn) plus what the scheduler needs to know to pick it:
+whether it proves optimality, whether it needs OR-Tools, and which keyword
+options (formulation, settings, deadline, stop) it accepts. Built-in engines
+register themselves in scheduler.py; `--engine auto` resolves to one of them
+with select_engine().
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+AUTO = "auto"
+
+
+@dataclass
+class Engine:
+    name: str
+    solve: Callable  # decomposition.SolveFn; must be picklable (module-level)
+    description: str
+    exact: bool  # proves optimality on the instances it accepts
+    requires_ortools: bool = False
+    warm_start: bool = False  # uses slot hints from the previous schedule
+    speed: int = 0  # relative cost, lower is faster; auto picks the fastest suitable engine
+    options: Tuple[str, ...] = ()  # keyword options the solve function accepts
+    is_available: Callable[[], bool] = field(default=lambda: True, repr=False)
+
+    def available(self) -> bool:
+        return self.is_available()
+
+
+ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine) -> Engine:
+    ENGINES[engine.name] = engine
+    return engine
+
+
+def engine_names() -> List[str]:
+    return list(ENGINES)
+
+
+def get_engine(name: str) -> Engine:
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}'. Choose from: {', '.join([AUTO] + engine_names())}")
+    return ENGINES[name]
+
+
+@dataclass
+class InstanceStats:
+    applications: int
+    core: int  # applications left after presolve
+    oversubscribed_students: int
+    oversubscribed_companies: int
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+def select_engine(stats: InstanceStats, exact: bool = True) -> Tuple[str, str]:
+    """
+    Picks the fastest available engine that guarantees the requested
+    optimality. Returns (engine name, reason).
+
+    Every interview takes one slot, so selection is a b-matching and slot
+    assignment an edge colouring: the flow engine is exact and polynomial,
+    the fastest exact choice. If an approximate schedule is acceptable, or no
+    exact engine is available, the fastest heuristic is used.
+    """
+    suitable = sorted((e for e in ENGINES.values() if e.available()), key=lambda e: e.speed)
+    if not suitable:
+        raise RuntimeError("No available scheduling engine can handle this instance.")
+
+    if not exact:
+        heuristic = next((e for e in suitable if not e.exact), None)
+        if heuristic:
+            return heuristic.name, "an approximate schedule is acceptable; using the fastest heuristic"
+    exact_engine = next((e for e in suitable if e.exact), None)
+    if exact_engine:
+        if stats.core == 0:
+            return exact_engine.name, "presolve fixed every application; only the slot assignment is left"
+        return exact_engine.name, (f"{stats.core} of {stats.applications} applications are contested "
+                                   f"({stats.oversubscribed_students} oversubscribed students, "
+                                   f"{stats.oversubscribed_companies} companies); using the fastest exact engine")
+    return suitable[0].name, "no exact engine is available; using the fastest heuristic"
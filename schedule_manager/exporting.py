@@ -0,0 +1,65 @@
+"""
+CSV schedule exports.
+
+Rows are written one at a time through the csv module to any text sink (a
+file, or the server's chunked HTTP writer), so memory stays flat regardless
+of the number of interviews and names containing commas or quotes are
+escaped correctly. Callers pass interviews already grouped/sorted (see
+Repository) so no export re-sorts or filters the full schedule.
+"""
+import csv
+from typing import Dict, Iterable, TextIO
+
+from schedule_manager.data_manager import Interview, Student, Company, time_label
+
+
+def write_companies_csv(out: TextIO, interviews: Iterable[Interview],
+                        students: Dict[str, Student], companies: Dict[str, Company]):
+    """All companies; interviews must be sorted by (company_id, start)."""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["Company ID", "Company Name", "Time", "Student ID", "Student Name", "Role"])
+    for i in interviews:
+        c = companies.get(i.company_id)
+        s = students.get(i.student_id)
+        writer.writerow([
+            i.company_id, c.name if c else i.company_id, time_label(i.start),
+            i.student_id, s.name if s else i.student_id, i.job_role_id,
+        ])
+
+
+def write_students_csv(out: TextIO, interviews: Iterable[Interview],
+                       students: Dict[str, Student], companies: Dict[str, Company]):
+    """All students; interviews must be sorted by (student_id, start)."""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["Student ID", "Student Name", "Time", "Company", "Role"])
+    for i in interviews:
+        c = companies.get(i.company_id)
+        s = students.get(i.student_id)
+        writer.writerow([
+            i.student_id, s.name if s else i.student_id, time_label(i.start),
+            c.name if c else i.company_id, i.job_role_id,
+        ])
+
+
+def write_company_csv(out: TextIO, company_id: str, interviews: Iterable[Interview],
+                      students: Dict[str, Student], companies: Dict[str, Company]):
+    """One company's interviews, sorted by start."""
+    c = companies.get(company_id)
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow([f"Schedule for {c.name if c else company_id}"])
+    writer.writerow(["Time", "Student ID", "Student Name", "Role"])
+    for i in interviews:
+        s = students.get(i.student_id)
+        writer.writerow([time_label(i.start), i.student_id, s.name if s else i.student_id, i.job_role_id])
+
+
+def write_student_csv(out: TextIO, student_id: str, interviews: Iterable[Interview],
+                      students: Dict[str, Student], companies: Dict[str, Company]):
+    """One student's interviews, sorted by start."""
+    s = students.get(student_id)
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow([f"Schedule for {s.name if s else student_id}"])
+    writer.writerow(["Time", "Company", "Role"])
+    for i in interviews:
+        c = companies.get(i.company_id)
+        writer.writerow([time_label(i.start), c.name if c else i.company_id, i.job_role_id])
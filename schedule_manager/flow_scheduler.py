@@ -0,0 +1,223 @@
+"""
+Exact scheduling without OR-Tools.
+
+Every interview takes exactly one slot, and each student and each company can
+do one interview per slot. Picking which applications to schedule is therefore
+a weighted b-matching on the student-company graph (degree <= number of slots),
+and assigning slots is an edge colouring of the chosen bipartite multigraph.
+By Konig's edge colouring theorem, a bipartite graph with maximum degree D can
+always be coloured with D colours, so every selection that respects the degree
+bounds fits into the slot grid.
+
+Phase 1 solves the selection as a min-cost flow (cost = -weight) using
+primal-dual augmentation. Phase 2 colours the selected edges with alternating
+path (Kempe chain) swaps.
+"""
+import heapq
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+from schedule_manager.problem import Problem
+
+INF = float("inf")
+
+
+class _FlowGraph:
+    """Residual graph stored as parallel edge arrays (edge i ^ 1 is its reverse)."""
+
+    def __init__(self, num_nodes: int):
+        self.n = num_nodes
+        self.adj: List[List[int]] = [[] for _ in range(num_nodes)]
+        self.to: List[int] = []
+        self.cap: List[int] = []
+        self.cost: List[int] = []
+
+    def add_edge(self, u: int, v: int, cap: int, cost: int) -> int:
+        idx = len(self.to)
+        self.to.append(v); self.cap.append(cap); self.cost.append(cost)
+        self.adj[u].append(idx)
+        self.to.append(u); self.cap.append(0); self.cost.append(-cost)
+        self.adj[v].append(idx + 1)
+        return idx
+
+
+def select_applications(problem: Problem) -> List[int]:
+    """
+    Returns the indices of a maximum-weight subset of the problem's
+    applications in which no student and no company appears more than
+    `num_slots` times.
+    """
+    num_slots = problem.num_slots
+    if not len(problem) or num_slots <= 0:
+        return []
+
+    ns, nc = problem.num_students, problem.num_companies
+    source, sink = 0, 1 + ns + nc
+    g = _FlowGraph(ns + nc + 2)
+
+    app_edges = [g.add_edge(1 + u, 1 + ns + v, 1, -weight) for u, v, weight in problem]
+    for u in range(ns):
+        g.add_edge(source, 1 + u, min(problem.student_degree(u), num_slots), 0)
+    for v in range(nc):
+        g.add_edge(1 + ns + v, sink, min(problem.company_degree(v), num_slots), 0)
+
+    # Initial potentials: the graph is a DAG (source -> students -> companies -> sink),
+    # so shortest distances can be read off layer by layer despite negative costs.
+    pot = [0] * g.n
+    for v in range(nc):
+        node = 1 + ns + v
+        pot[node] = min((g.cost[e ^ 1] for e in g.adj[node] if g.to[e] != sink), default=0)
+    pot[sink] = min((pot[1 + ns + v] for v in range(nc)), default=0)
+
+    to, cap, cost, adj = g.to, g.cap, g.cost, g.adj
+    while True:
+        # Dijkstra on reduced costs (all non-negative thanks to the potentials)
+        dist = [INF] * g.n
+        dist[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            pu = pot[u]
+            for e in adj[u]:
+                if cap[e] > 0:
+                    v = to[e]
+                    nd = d + cost[e] + pu - pot[v]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+
+        if dist[sink] == INF:
+            break
+        limit = dist[sink]
+        for u in range(g.n):
+            pot[u] += dist[u] if dist[u] < limit else limit
+
+        # Real cost of the cheapest augmenting path. Once it is no longer
+        # negative, sending more flow can only lower the total weight.
+        if pot[sink] - pot[source] >= 0:
+            break
+
+        # Blocking flow on the admissible (zero reduced cost) subgraph
+        while True:
+            level = [-1] * g.n
+            level[source] = 0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                for e in adj[u]:
+                    v = to[e]
+                    if cap[e] > 0 and level[v] < 0 and cost[e] + pot[u] - pot[v] == 0:
+                        level[v] = level[u] + 1
+                        queue.append(v)
+            if level[sink] < 0:
+                break
+
+            it = [0] * g.n
+            while _augment(g, pot, level, it, source, sink):
+                pass
+
+    return [i for i, e in enumerate(app_edges) if cap[e] == 0]
+
+
+def _augment(g: _FlowGraph, pot: List[int], level: List[int], it: List[int], source: int, sink: int) -> bool:
+    """Pushes one unit along an admissible level-graph path (iterative DFS)."""
+    to, cap, cost, adj = g.to, g.cap, g.cost, g.adj
+    path: List[int] = []
+    u = source
+    while u != sink:
+        edges = adj[u]
+        advanced = False
+        while it[u] < len(edges):
+            e = edges[it[u]]
+            v = to[e]
+            if cap[e] > 0 and level[v] == level[u] + 1 and cost[e] + pot[u] - pot[v] == 0:
+                path.append(e)
+                u = v
+                advanced = True
+                break
+            it[u] += 1
+        if not advanced:
+            if u == source:
+                return False
+            # Dead end: retreat and skip the edge that led here
+            level[u] = -1
+            e = path.pop()
+            u = to[e ^ 1]
+            it[u] += 1
+    for e in path:
+        cap[e] -= 1
+        cap[e ^ 1] += 1
+    return True
+
+
+def colour_edges(edges: Sequence[Tuple[Hashable, Hashable]], num_slots: int) -> List[int]:
+    """
+    Assigns each (student, company) edge a colour in [0, num_slots) so that no
+    two edges sharing an endpoint get the same colour. Requires every vertex
+    degree to be <= num_slots, which Konig's theorem shows is sufficient.
+    """
+    s_free: Dict[Hashable, List[int]] = {}
+    c_free: Dict[Hashable, List[int]] = {}
+    for s_key, c_key in edges:
+        if s_key not in s_free:
+            s_free[s_key] = [-1] * num_slots
+        if c_key not in c_free:
+            c_free[c_key] = [-1] * num_slots
+
+    colour = [-1] * len(edges)
+    for e, (s_key, c_key) in enumerate(edges):
+        at_s = s_free[s_key]
+        at_c = c_free[c_key]
+        a = at_s.index(-1)
+        if at_c[a] != -1:
+            b = at_c.index(-1)
+            # Swap colours a/b along the alternating path starting at the
+            # company. The graph is bipartite, so the path never reaches s_key.
+            path = []
+            on_company_side = True
+            node, want, other = c_key, a, b
+            while True:
+                table = c_free[node] if on_company_side else s_free[node]
+                nxt = table[want]
+                if nxt == -1:
+                    break
+                path.append(nxt)
+                ns, nc = edges[nxt]
+                node = ns if on_company_side else nc
+                on_company_side = not on_company_side
+                want, other = other, want
+            for p in path:
+                ps, pc = edges[p]
+                s_free[ps][colour[p]] = -1
+                c_free[pc][colour[p]] = -1
+            for p in path:
+                ps, pc = edges[p]
+                colour[p] = b if colour[p] == a else a
+                s_free[ps][colour[p]] = p
+                c_free[pc][colour[p]] = p
+        colour[e] = a
+        at_s[a] = e
+        at_c[a] = e
+    return colour
+
+
+def solve(problem: Problem, fixed: Optional[Set[int]] = None) -> Tuple[Dict[int, int], int]:
+    """
+    Runs both phases. Returns ({app index: slot index}, objective value), where
+    the objective is on the same scale as the CP-SAT engine.
+
+    Applications in `fixed` (see presolve.kernelize) are always selected; the
+    flow only decides among the rest.
+    """
+    if fixed:
+        core = [i for i in range(len(problem)) if i not in fixed]
+        selected = sorted(fixed) + [core[k] for k in select_applications(problem.subproblem(core))]
+    else:
+        selected = select_applications(problem)
+    student, company = problem.student, problem.company
+    colours = colour_edges([(student[i], company[i]) for i in selected], problem.num_slots)
+    assignment = {i: colours[k] for k, i in enumerate(selected)}
+    objective = sum(problem.weight[i] for i in selected)
+    return assignment, objective
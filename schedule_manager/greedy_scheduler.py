@@ -0,0 +1,272 @@
+"""
+Dependency-free heuristic scheduling: greedy construction + local search.
+
+For machines where neither OR-Tools nor an exact engine fits the instance.
+Each student and each company keeps a bitset of busy slots (a Python int),
+so checking whether slot t is free for both sides is a shift and a mask, and
+the earliest common free slot is the lowest zero bit of their union.
+
+1. Greedy: applications are placed in descending order of weight
+   (shortlisted and high-priority first, since that is what the weight
+   encodes) at the earliest slot free for both sides.
+2. Local search: every unscheduled application tries, in turn,
+   - a direct insert (earlier moves may have opened a slot),
+   - an augmenting move: relocate the interview(s) blocking a slot - the
+     student's, the company's or both - to other free slots, then insert,
+   - a swap: evict the blocking interviews, move them elsewhere or refill
+     the slots they free, and keep the change if the objective went up.
+   Passes repeat until one makes no improvement, the objective reaches the
+   upper bound below, or the time budget is spent.
+
+The objective is the sum of application_weight over scheduled applications,
+the same scale as the exact engines. The reported bound is the smaller of
+two relaxations (each student, resp. each company, keeps its best `slots`
+applications), so the gap is an honest upper estimate.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from schedule_manager.problem import Problem
+
+# Local search budget when the caller sets none
+DEFAULT_TIME_LIMIT = 1.0
+# Minimum seconds between two on_solution reports within a local search pass
+REPORT_INTERVAL = 0.25
+
+
+class _State:
+    def __init__(self, problem: Problem):
+        self.p = problem
+        self.slot_of = [-1] * len(problem)
+        self.busy_s = [0] * problem.num_students
+        self.busy_c = [0] * problem.num_companies
+        # (side, node, slot) -> app occupying it; side 0 = student, 1 = company
+        self.owner: Dict[Tuple[int, int, int], int] = {}
+        self.objective = 0
+
+    def fits(self, i: int, t: int) -> bool:
+        p = self.p
+        if t < 0 or t >= p.num_slots:
+            return False
+        return not ((self.busy_s[p.student[i]] | self.busy_c[p.company[i]]) >> t) & 1
+
+    def first_fit(self, i: int, busy: Optional[int] = None) -> int:
+        """Earliest slot of app i that is free for both sides (or in `busy`), -1 if none."""
+        p = self.p
+        if busy is None:
+            busy = self.busy_s[p.student[i]] | self.busy_c[p.company[i]]
+        free = ~busy & ((1 << p.num_slots) - 1)
+        return (free & -free).bit_length() - 1
+
+    def place(self, i: int, t: int):
+        p = self.p
+        s, c = p.student[i], p.company[i]
+        self.busy_s[s] |= 1 << t
+        self.busy_c[c] |= 1 << t
+        self.owner[(0, s, t)] = i
+        self.owner[(1, c, t)] = i
+        self.slot_of[i] = t
+        self.objective += p.weight[i]
+
+    def remove(self, i: int):
+        p = self.p
+        t = self.slot_of[i]
+        s, c = p.student[i], p.company[i]
+        self.busy_s[s] &= ~(1 << t)
+        self.busy_c[c] &= ~(1 << t)
+        del self.owner[(0, s, t)]
+        del self.owner[(1, c, t)]
+        self.slot_of[i] = -1
+        self.objective -= p.weight[i]
+
+    def assignment(self) -> Dict[int, int]:
+        return {i: t for i, t in enumerate(self.slot_of) if t >= 0}
+
+    def blockers(self, i: int, t: int) -> Set[int]:
+        p = self.p
+        found = set()
+        for key in ((0, p.student[i], t), (1, p.company[i], t)):
+            j = self.owner.get(key)
+            if j is not None:
+                found.add(j)
+        return found
+
+
+def _greedy(state: _State, order: List[int], hints: Optional[Dict[int, int]]):
+    if hints:
+        for i in order:
+            t = hints.get(i)
+            if t is not None and state.fits(i, t):
+                state.place(i, t)
+    for i in order:
+        if state.slot_of[i] < 0:
+            t = state.first_fit(i)
+            if t >= 0:
+                state.place(i, t)
+
+
+def _can_relocate(state: _State, i: int, t: int, blocking: Set[int]) -> bool:
+    """Checks on the bitsets alone that every blocker has another home once i takes slot t."""
+    p = state.p
+    s_i, c_i, m_i = p.student[i], p.company[i], 1 << t
+    for j in blocking:
+        s, c = p.student[j], p.company[j]
+        busy_s, busy_c = state.busy_s[s], state.busy_c[c]
+        for k in blocking:
+            m_k = 1 << state.slot_of[k]
+            if p.student[k] == s:
+                busy_s &= ~m_k
+            if p.company[k] == c:
+                busy_c &= ~m_k
+        busy = busy_s | busy_c | (m_i if s == s_i or c == c_i else 0)
+        if state.first_fit(j, busy) < 0:
+            return False
+    return True
+
+
+def _try_relocate(state: _State, i: int, t: int) -> bool:
+    """Moves the interviews blocking app i at slot t elsewhere, then places i there."""
+    blocking = state.blockers(i, t)
+    if not _can_relocate(state, i, t, blocking):
+        return False
+    moved = []
+    for j in blocking:
+        moved.append((j, state.slot_of[j]))
+        state.remove(j)
+    # Reserve t for i while finding new homes for the blockers
+    state.place(i, t)
+    ok = True
+    for j, _ in moved:
+        nt = state.first_fit(j)
+        if nt < 0:
+            # Blockers sharing a side competed for the same free slot
+            ok = False
+            break
+        state.place(j, nt)
+    if ok:
+        return True
+    # Roll back
+    for j, _ in moved:
+        if state.slot_of[j] >= 0:
+            state.remove(j)
+    state.remove(i)
+    for j, old in moved:
+        state.place(j, old)
+    return False
+
+
+def _undo(state: _State, log: List[Tuple[int, int]]):
+    for j, old in reversed(log):
+        if old < 0:
+            state.remove(j)
+        else:
+            state.place(j, old)
+
+
+def _try_swap(state: _State, i: int) -> bool:
+    """
+    Evicts the interviews blocking i at some slot, schedules i there, moves
+    the evicted ones elsewhere if they fit and refills the slots they freed
+    with unscheduled applications of their other side (a short augmenting
+    path). Kept only if the objective goes up.
+    """
+    p = state.p
+    before = state.objective
+    for t in range(p.num_slots):
+        blocking = sorted(state.blockers(i, t), key=lambda j: -p.weight[j])
+        log: List[Tuple[int, int]] = []  # (app, slot it was removed from, or -1 if placed)
+        for j in blocking:
+            log.append((j, state.slot_of[j]))
+            state.remove(j)
+        state.place(i, t)
+        log.append((i, -1))
+        for j in blocking:
+            nt = state.first_fit(j)
+            if nt >= 0:
+                state.place(j, nt)
+                log.append((j, -1))
+                continue
+            side = p.apps_of_company(p.company[j]) if p.student[j] == p.student[i] else p.apps_of_student(p.student[j])
+            for k in sorted(side, key=lambda k: -p.weight[k]):
+                if state.slot_of[k] < 0 and k != j:
+                    nt = state.first_fit(k)
+                    if nt >= 0:
+                        state.place(k, nt)
+                        log.append((k, -1))
+        if state.objective > before:
+            return True
+        _undo(state, log)
+    return False
+
+
+def upper_bound(problem: Problem) -> int:
+    """min over sides of: each student (resp. company) scheduling its `num_slots` heaviest applications."""
+    def side_bound(ptr, members) -> int:
+        total = 0
+        for r in range(len(ptr) - 1):
+            group = sorted((problem.weight[i] for i in members[ptr[r]:ptr[r + 1]]), reverse=True)
+            total += sum(group[:problem.num_slots])
+        return total
+    return min(side_bound(problem.student_ptr, problem.student_apps),
+               side_bound(problem.company_ptr, problem.company_apps))
+
+
+def solve(problem: Problem, fixed: Optional[Set[int]] = None, hints: Optional[Dict[int, int]] = None,
+          deadline: Optional[float] = None,
+          on_solution: Optional[Callable[[Dict[int, int], int], None]] = None,
+          stop=None) -> Tuple[Dict[int, int], int, int]:
+    """
+    Returns ({app index: slot index}, objective, upper bound). Applications in
+    `fixed` are placed first; hinted slots are tried before first-fit.
+    on_solution receives (assignment, objective) after the greedy pass and
+    during local search (at most every REPORT_INTERVAL seconds, and at the
+    end of every improving pass); setting `stop` (an Event) ends the search
+    early. The search also ends as soon as the objective reaches the bound.
+    """
+    if deadline is None:
+        deadline = time.time() + DEFAULT_TIME_LIMIT
+    fixed = fixed or set()
+    weight = problem.weight
+    order = sorted(range(len(problem)), key=lambda i: (i not in fixed, -weight[i], i))
+
+    bound = upper_bound(problem)
+    state = _State(problem)
+    _greedy(state, order, hints)
+    if on_solution:
+        on_solution(state.assignment(), state.objective)
+
+    improved = state.objective < bound
+    stopped = False
+    last_report = time.time()
+    while improved and not stopped and time.time() < deadline:
+        improved = unreported = False
+        for n, i in enumerate(order):
+            # The stop Event may be a manager proxy; poll it sparingly
+            if stop is not None and n % 256 == 0 and stop.is_set():
+                stopped = True
+                break
+            if state.slot_of[i] >= 0:
+                continue
+            if time.time() >= deadline:
+                break
+            t = state.first_fit(i)
+            if t >= 0:
+                state.place(i, t)
+            elif not (any(_try_relocate(state, i, t) for t in range(problem.num_slots))
+                      or _try_swap(state, i)):
+                continue
+            improved = unreported = True
+            if state.objective == bound:
+                # Provably optimal: the rest of the pass cannot improve on it
+                break
+            if on_solution and time.time() - last_report >= REPORT_INTERVAL:
+                on_solution(state.assignment(), state.objective)
+                last_report = time.time()
+                unreported = False
+        if unreported and on_solution:
+            on_solution(state.assignment(), state.objective)
+            last_report = time.time()
+        if state.objective == bound:
+            break
+
+    return state.assignment(), state.objective, bound
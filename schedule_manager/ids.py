@@ -0,0 +1,75 @@
+"""
+Dense integer IDs for students, companies and job roles.
+
+Every join in the scheduler used to hash long string IDs such as
+"d_f_n_technology_pvt_ltd_software_engineer". The registry gives each ID a
+small int (0, 1, 2, ... in order of first appearance) so hot loops can index
+plain lists instead, and hands back one canonical string object per ID, so
+the thousands of Application/Interview objects that mention a company share
+that string rather than each holding a parsed copy.
+
+A DataManager owns one registry and feeds it on every load; IDs are only
+ever appended, so an int stays valid for the life of the process even as
+data is re-imported.
+"""
+from typing import Dict, Iterable, List, Optional
+
+
+class IdSpace:
+    __slots__ = ("index", "keys")
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.keys: List[str] = []
+
+    def intern(self, key: str) -> int:
+        idx = self.index.get(key)
+        if idx is None:
+            idx = len(self.keys)
+            self.index[key] = idx
+            self.keys.append(key)
+        return idx
+
+    def canonical(self, key: str) -> str:
+        """The registry's own copy of key (interning it if new)."""
+        return self.keys[self.intern(key)]
+
+    def get(self, key: str) -> Optional[int]:
+        return self.index.get(key)
+
+    def __getitem__(self, idx: int) -> str:
+        return self.keys[idx]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class IdRegistry:
+    def __init__(self):
+        self.students = IdSpace()
+        self.companies = IdSpace()
+        self.roles = IdSpace()
+
+    def add_companies(self, companies: Iterable):
+        companies_id, roles_id = self.companies.canonical, self.roles.canonical
+        for c in companies:
+            c.id = companies_id(c.id)
+            for r in c.job_roles:
+                r.id = roles_id(r.id)
+                r.company_id = companies_id(r.company_id)
+
+    def add_students(self, students: Iterable):
+        students_id, companies_id, roles_id = self.students.canonical, self.companies.canonical, self.roles.canonical
+        for s in students:
+            s.id = students_id(s.id)
+            for a in s.applications:
+                a.student_id = s.id if a.student_id == s.id else students_id(a.student_id)
+                a.company_id = companies_id(a.company_id)
+                a.job_role_id = roles_id(a.job_role_id)
+
+    def add_interviews(self, interviews: Iterable):
+        students_id, companies_id, roles_id = self.students.canonical, self.companies.canonical, self.roles.canonical
+        for i in interviews:
+            i.student_id = students_id(i.student_id)
+            i.company_id = companies_id(i.company_id)
+            i.job_role_id = roles_id(i.job_role_id)
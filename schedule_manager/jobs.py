@@ -0,0 +1,232 @@
+"""
+Background schedule jobs.
+
+The web server must not block on a CP-SAT solve, so every /api/run-schedule
+request becomes a job: the solve runs in a separate worker process, which
+streams progress events back over a queue. A listener thread in the server
+process folds those events into the job's status, which the dashboard polls.
+
+Jobs run one at a time (they all write the same schedule.json). A request
+whose parameters match a job that is still queued or running is coalesced
+into that job instead of starting another solve.
+
+Every progress event is also kept in the job's event log, which
+/api/jobs/<id>/events streams to the dashboard as server-sent events. Each
+job gets a stop Event (from a multiprocessing Manager, so it also reaches
+component solves in the worker's process pool); accept() sets it and the
+solve ends with the best schedule found so far, which is saved as usual.
+"""
+import json
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from schedule_manager.data_manager import open_data_manager
+
+EVENT_DATE = "2024-10-25"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Use fresh interpreters for workers: forking a threaded server is unsafe
+_mp = multiprocessing.get_context("spawn")
+
+
+def run_schedule_job(job_id: str, params: Dict[str, Any], data_dir: str, events, stop=None) -> None:
+    """Worker process entry point: solve, save the schedule, report back."""
+    from schedule_manager.scheduler import Scheduler, SolverSettings
+    from schedule_manager.engines import AUTO
+
+    def report(event: Dict[str, Any]):
+        events.put((job_id, "progress", event))
+
+    try:
+        dm = open_data_manager(data_dir)
+        scheduler = Scheduler(dm, profile_memory=bool(params.get("profile")))
+        # Start from the saved schedule so small edits re-solve quickly
+        scheduler.run(
+            params.get("event_date", EVENT_DATE),
+            engine=params.get("engine", AUTO),
+            warm_start=True,
+            settings=SolverSettings.from_dict(params),
+            on_progress=report,
+            stop=stop,
+            use_cache=params.get("cache", True),
+        )
+        if not scheduler.run_info:
+            events.put((job_id, FAILED, f"The {params.get('engine')} engine is not available"))
+            return
+        scheduler.save_results()
+        events.put((job_id, DONE, scheduler.run_info))
+    except Exception as e:
+        events.put((job_id, FAILED, str(e)))
+
+
+class JobManager:
+    def __init__(self, data_dir: str = "schedule_manager/data"):
+        self.data_dir = data_dir
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.pending: List[str] = []
+        self.current: Optional[str] = None
+        self.process = None
+        self.lock = threading.Lock()
+        # Notified whenever a job's status or event log changes
+        self.changed = threading.Condition(self.lock)
+        self.event_logs: Dict[str, List[Dict[str, Any]]] = {}
+        self.stops: Dict[str, Any] = {}
+        self.manager = None
+        self.events = _mp.Queue()
+        self.listener = threading.Thread(target=self._listen, daemon=True)
+        self.listener.start()
+
+    @staticmethod
+    def job_key(params: Dict[str, Any]) -> str:
+        return json.dumps(params, sort_keys=True)
+
+    def submit(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Queues a schedule run, or returns the queued/running job with the same parameters."""
+        key = self.job_key(params)
+        with self.lock:
+            for job in self.jobs.values():
+                if job["key"] == key and job["status"] in (QUEUED, RUNNING):
+                    job["requests"] += 1
+                    return self._public(job, coalesced=True)
+
+            job_id = uuid.uuid4().hex[:12]
+            job = {
+                "id": job_id,
+                "key": key,
+                "params": params,
+                "status": QUEUED,
+                "phase": None,
+                "best_objective": None,
+                "progress": {},
+                "result": None,
+                "error": None,
+                "requests": 1,
+                "accepted_early": False,
+                "cached": None,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+            }
+            self.jobs[job_id] = job
+            self.event_logs[job_id] = []
+            self.pending.append(job_id)
+            self._start_next()
+            return self._public(job, coalesced=False)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return self._public(job) if job else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [self._public(j) for j in sorted(self.jobs.values(), key=lambda j: j["created_at"])]
+
+    def accept(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Stops a running job's search; it finishes with the best schedule found
+        so far. Returns the job (None if unknown); raises ValueError if the job
+        is not running.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] != RUNNING:
+                raise ValueError(f"Job {job_id} is {job['status']}, not running")
+            if "objective" not in job["progress"]:
+                raise ValueError(f"Job {job_id} has not found a schedule yet")
+            job["accepted_early"] = True
+            self.stops[job_id].set()
+            return self._public(job)
+
+    def wait_events(self, job_id: str, cursor: int, timeout: float = 15.0) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Blocks until the job has events past `cursor`, it finishes, or the
+        timeout passes. Returns (new events, the job if it has finished).
+        """
+        with self.changed:
+            self.changed.wait_for(
+                lambda: len(self.event_logs.get(job_id, ())) > cursor
+                or self.jobs.get(job_id, {}).get("status") in (DONE, FAILED),
+                timeout)
+            events = self.event_logs.get(job_id, [])[cursor:]
+            job = self.jobs.get(job_id)
+            finished = job is not None and job["status"] in (DONE, FAILED)
+            return events, self._public(job) if finished else None
+
+    def _public(self, job: Dict[str, Any], coalesced: Optional[bool] = None) -> Dict[str, Any]:
+        data = {k: v for k, v in job.items() if k != "key"}
+        if coalesced is not None:
+            data["coalesced"] = coalesced
+        return data
+
+    def _start_next(self):
+        # Caller holds self.lock
+        if self.current is not None or not self.pending:
+            return
+        job_id = self.pending.pop(0)
+        job = self.jobs[job_id]
+        job["status"] = RUNNING
+        job["started_at"] = time.time()
+        self.current = job_id
+        if self.manager is None:
+            self.manager = _mp.Manager()
+        self.stops[job_id] = self.manager.Event()
+        self.process = _mp.Process(
+            target=run_schedule_job,
+            args=(job_id, job["params"], self.data_dir, self.events, self.stops[job_id])
+        )
+        self.process.start()
+
+    def _finish(self, job_id: str, status: str, result: Any):
+        # Caller holds self.lock
+        job = self.jobs[job_id]
+        job["status"] = status
+        job["phase"] = status
+        job["finished_at"] = time.time()
+        if status == DONE:
+            job["result"] = result
+            job["best_objective"] = result.get("objective")
+            job["cached"] = result.get("cached", False)
+        else:
+            job["error"] = result
+        self.stops.pop(job_id, None)
+        if self.current == job_id:
+            self.current = None
+            self.process = None
+        self.changed.notify_all()
+        self._start_next()
+
+    def _listen(self):
+        while True:
+            try:
+                job_id, kind, payload = self.events.get(timeout=0.5)
+            except queue.Empty:
+                with self.lock:
+                    # Worker died without reporting (crash, kill)
+                    if self.process is not None and not self.process.is_alive() and self.events.empty():
+                        self._finish(self.current, FAILED, f"Worker exited with code {self.process.exitcode}")
+                continue
+
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                if kind == "progress":
+                    job["phase"] = payload.get("phase")
+                    job["progress"].update(payload)
+                    if payload.get("best_objective") is not None:
+                        job["best_objective"] = payload["best_objective"]
+                    self.event_logs[job_id].append(payload)
+                    self.changed.notify_all()
+                else:
+                    self._finish(job_id, kind, payload)
@@ -0,0 +1,86 @@
+"""
+Append-only journal of application edits.
+
+Rewriting students.json for every priority or status change gets slow and
+risky once there are thousands of applications. Instead, DataManager appends
+each edit as one JSON line to students.journal and replays the journal over
+the students.json snapshot on load. Compaction folds the journal back into the
+snapshot and moves its records to students.audit.jsonl, so the history of who
+changed what is never lost.
+
+Every append is fsync'ed before returning. A crash mid-append leaves at most
+one truncated last line, which is ignored on read and cut off before the next
+append.
+"""
+import getpass
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+def default_actor() -> str:
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "unknown"
+
+
+class Journal:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def append(self, records: Iterable[Dict], actor: Optional[str] = None) -> int:
+        """Stamps records with actor and time, appends them durably. Returns how many were written."""
+        ts = datetime.now().isoformat(timespec="seconds")
+        actor = actor or default_actor()
+        lines = [json.dumps(dict(r, ts=ts, actor=actor)) + "\n" for r in records]
+        if not lines:
+            return 0
+        self._drop_partial_tail()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    def read(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # torn write from a crash: never acknowledged, skip it
+                records.append(json.loads(line))
+        return records
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+        with open(self.path, "rb") as f:
+            return sum(1 for _ in f)
+
+    def archive_to(self, audit_path: Path):
+        """Moves all complete records to the audit log and empties the journal."""
+        records = self.read()
+        if records:
+            with open(audit_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r) + "\n" for r in records))
+                f.flush()
+                os.fsync(f.fileno())
+        if self.path.exists():
+            os.remove(self.path)
+
+    def _drop_partial_tail(self):
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+
+def read_audit_log(audit_path: Path) -> List[Dict]:
+    return Journal(audit_path).read()
@@ -0,0 +1,54 @@
+"""
+Kernelization pass run before model building.
+
+A student (or company) with no more applications than there are slots can
+never hit its one-interview-per-slot limit, whatever else is scheduled. An
+application whose student AND company are both in that position can therefore
+always be added to any schedule, and since every weight is positive it is part
+of every optimal schedule (Konig's theorem guarantees the slots can be found).
+
+Those applications are "fixed": only their slot is left to decide. Everything
+else - the applications touching an oversubscribed student or company - is the
+contested core, the only part the optimizer has to select from.
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+from schedule_manager.problem import Problem
+
+
+@dataclass
+class Kernel:
+    fixed: List[int] = field(default_factory=list)
+    core: List[int] = field(default_factory=list)
+    oversubscribed_students: int = 0
+    oversubscribed_companies: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.fixed) + len(self.core)
+
+    def summary(self) -> str:
+        pct = 100.0 * len(self.fixed) / self.total if self.total else 0.0
+        return (f"Presolve fixed {len(self.fixed)}/{self.total} applications ({pct:.0f}%); "
+                f"contested core: {len(self.core)} applications, "
+                f"{self.oversubscribed_companies} oversubscribed companies, "
+                f"{self.oversubscribed_students} oversubscribed students.")
+
+
+def kernelize(problem: Problem) -> Kernel:
+    num_slots = problem.num_slots
+    # Degrees are the CSR row lengths
+    student_ok = [problem.student_degree(s) <= num_slots for s in range(problem.num_students)]
+    company_ok = [problem.company_degree(c) <= num_slots for c in range(problem.num_companies)]
+
+    kernel = Kernel(
+        oversubscribed_students=sum(1 for s in range(problem.num_students) if not student_ok[s]),
+        oversubscribed_companies=sum(1 for c in range(problem.num_companies) if not company_ok[c]),
+    )
+    for i, (s, c) in enumerate(zip(problem.student, problem.company)):
+        if student_ok[s] and company_ok[c]:
+            kernel.fixed.append(i)
+        else:
+            kernel.core.append(i)
+    return kernel
@@ -0,0 +1,124 @@
+"""
+Array-backed scheduling instance consumed by every engine.
+
+Applications are stored as parallel int arrays (student, company, weight,
+status), students and companies as dense ints 0..n-1, and the two adjacency
+lists - student -> applications and company -> applications - in compressed
+sparse row (CSR) form: the applications of student s are
+student_apps[student_ptr[s]:student_ptr[s + 1]].
+
+Scheduler.compile_problem builds one in a single pass over the loaded
+students; presolve, decomposition and the engines then work on contiguous
+arrays instead of dicts of lists keyed by string IDs.
+"""
+from array import array
+from typing import Dict, Hashable, Iterator, List, Sequence, Tuple
+
+from schedule_manager.data_manager import AppStatus
+
+# Status codes stored in Problem.status
+STATUS_CODES: Dict[AppStatus, int] = {s: k for k, s in enumerate(AppStatus)}
+
+# (student key, company key, weight)
+SolverApp = Tuple[Hashable, Hashable, int]
+
+
+def _csr(keys: array, num_rows: int) -> Tuple[array, array]:
+    """Counting sort of application indices by key: (row pointers, app indices)."""
+    ptr = array("i", bytes(4 * (num_rows + 1)))
+    for k in keys:
+        ptr[k + 1] += 1
+    for r in range(num_rows):
+        ptr[r + 1] += ptr[r]
+    fill = array("i", ptr[:num_rows])
+    apps = array("i", bytes(4 * len(keys)))
+    for i, k in enumerate(keys):
+        apps[fill[k]] = i
+        fill[k] += 1
+    return ptr, apps
+
+
+class Problem:
+    __slots__ = ("num_slots", "num_students", "num_companies", "student", "company", "weight", "status",
+                 "student_ptr", "student_apps", "company_ptr", "company_apps")
+
+    def __init__(self, num_slots: int, num_students: int, num_companies: int,
+                 student: array, company: array, weight: array, status: array = None):
+        self.num_slots = num_slots
+        self.num_students = num_students
+        self.num_companies = num_companies
+        self.student = student
+        self.company = company
+        self.weight = weight
+        self.status = status if status is not None else array("b", bytes(len(student)))
+        self.student_ptr, self.student_apps = _csr(student, num_students)
+        self.company_ptr, self.company_apps = _csr(company, num_companies)
+
+    def __len__(self) -> int:
+        return len(self.student)
+
+    def __iter__(self) -> Iterator[SolverApp]:
+        return zip(self.student, self.company, self.weight)
+
+    def apps_of_student(self, s: int) -> array:
+        return self.student_apps[self.student_ptr[s]:self.student_ptr[s + 1]]
+
+    def apps_of_company(self, c: int) -> array:
+        return self.company_apps[self.company_ptr[c]:self.company_ptr[c + 1]]
+
+    def student_degree(self, s: int) -> int:
+        return self.student_ptr[s + 1] - self.student_ptr[s]
+
+    def company_degree(self, c: int) -> int:
+        return self.company_ptr[c + 1] - self.company_ptr[c]
+
+    @classmethod
+    def from_apps(cls, apps: Sequence[SolverApp], num_slots: int) -> "Problem":
+        """Builds a problem from (student key, company key, weight) tuples, relabelling keys densely."""
+        students: Dict[Hashable, int] = {}
+        companies: Dict[Hashable, int] = {}
+        student, company, weight = array("i"), array("i"), array("i")
+        for s_key, c_key, w in apps:
+            student.append(students.setdefault(s_key, len(students)))
+            company.append(companies.setdefault(c_key, len(companies)))
+            weight.append(w)
+        return cls(num_slots, len(students), len(companies), student, company, weight)
+
+    def subproblem(self, indices: Sequence[int]) -> "Problem":
+        """The applications at `indices` (in that order) as a problem with its own dense labels."""
+        students: Dict[int, int] = {}
+        companies: Dict[int, int] = {}
+        student, company, weight, status = array("i"), array("i"), array("i"), array("b")
+        for i in indices:
+            student.append(students.setdefault(self.student[i], len(students)))
+            company.append(companies.setdefault(self.company[i], len(companies)))
+            weight.append(self.weight[i])
+            status.append(self.status[i])
+        return Problem(self.num_slots, len(students), len(companies), student, company, weight, status)
+
+    def components(self) -> List[List[int]]:
+        """Application indices grouped by connected component of the student-company graph."""
+        seen_student = bytearray(self.num_students)
+        seen_company = bytearray(self.num_companies)
+        groups = []
+        for start in range(self.num_students):
+            if seen_student[start] or self.student_degree(start) == 0:
+                continue
+            seen_student[start] = 1
+            comp: List[int] = []
+            stack = [start]
+            while stack:
+                s = stack.pop()
+                for i in self.apps_of_student(s):
+                    comp.append(i)
+                    c = self.company[i]
+                    if not seen_company[c]:
+                        seen_company[c] = 1
+                        for j in self.apps_of_company(c):
+                            s2 = self.student[j]
+                            if not seen_student[s2]:
+                                seen_student[s2] = 1
+                                stack.append(s2)
+            comp.sort()
+            groups.append(comp)
+        return groups
@@ -0,0 +1,69 @@
+"""
+Per-phase wall time and memory profile of a scheduling run.
+
+Scheduler wraps each phase (load, compile, presolve, solve, extract, save)
+in Profiler.phase(); engines add their own counters (model size, CP-SAT
+conflicts/branches/presolve time, extraction time) through
+SolveResult.stats, which land in the report's "engine" section.
+
+Wall time is always recorded. Memory (the tracemalloc peak above the
+phase's starting allocation) only with memory=True: tracing every
+allocation slows Python code down noticeably, so it is opt-in
+(`cli.py schedule --profile`, `"profile": true` in the API request).
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Profiler:
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.phases: List[Dict[str, Any]] = []
+        self.engine: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_tracing = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record: Dict[str, Any] = {"phase": name, "wall_s": round(time.perf_counter() - start, 4)}
+            if self.memory:
+                record["peak_mb"] = round((tracemalloc.get_traced_memory()[1] - base) / 1e6, 2)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.phases.append(record)
+
+    def add_engine_stats(self, stats: Dict[str, float]):
+        for key, value in stats.items():
+            self.engine[key] = self.engine.get(key, 0) + value
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "phases": list(self.phases),
+            "total_s": round(sum(p["wall_s"] for p in self.phases), 4),
+            "memory": self.memory,
+            "engine": {k: round(v, 4) if isinstance(v, float) else v for k, v in self.engine.items()},
+        }
+
+    def summary(self) -> str:
+        """Human-readable table for the CLI."""
+        lines = [f"  {'phase':<10} {'wall s':>9}" + (f" {'peak MB':>9}" if self.memory else "")]
+        for p in self.phases:
+            lines.append(f"  {p['phase']:<10} {p['wall_s']:>9.4f}" + (f" {p['peak_mb']:>9.2f}" if self.memory else ""))
+        if self.engine:
+            lines.append("  engine: " + ", ".join(f"{k}={_fmt(v)}" for k, v in self.engine.items()))
+        return "\n".join(lines)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
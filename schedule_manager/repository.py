@@ -0,0 +1,176 @@
+"""
+Process-wide in-memory view of the data files for the web server.
+
+DataManager re-parses the JSON files on every call, which is fine for the CLI
+but too slow to do on every dashboard request. Repository keeps the parsed
+students, companies and interviews (plus their encoded API responses) in
+memory and reloads a dataset only when its files' mtime/size change - e.g. after a
+background scheduling job rewrote schedule.json - or when a write made
+through the API calls invalidate().
+
+All methods are thread-safe; callers must treat returned objects as read-only.
+"""
+import json
+import os
+import threading
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from schedule_manager.data_manager import open_data_manager, Student, Company, Interview
+
+
+class _Entry:
+    __slots__ = ("stamp", "value", "encoded", "derived")
+
+    def __init__(self, stamp, value):
+        self.stamp = stamp
+        self.value = value
+        self.encoded: Optional[bytes] = None
+        # Indexes built from value, dropped together with it on reload
+        self.derived: Dict[str, Any] = {}
+
+
+class Repository:
+    def __init__(self, data_dir: str = "schedule_manager/data"):
+        self.dm = open_data_manager(data_dir)
+        self.lock = threading.RLock()
+        self.entries: Dict[str, _Entry] = {}
+        self.sources: Dict[str, Tuple[Any, Callable[[], Any], Callable[[Any], Any]]] = {
+            # name: (file, loader, to JSON-able)
+            # Edits are journaled next to students.json, so watch both files
+            "students": ((self.dm.students_file, getattr(self.dm, "journal_file", self.dm.students_file)),
+                         self._load_students, lambda v: [asdict(s) for s in v[0]]),
+            "companies": (self.dm.companies_file, self._load_companies, lambda v: [asdict(c) for c in v[0]]),
+            "schedule": (self.dm.schedule_file, self.dm.load_interviews, lambda v: [i.to_dict() for i in v]),
+            "schedule_meta": (self.dm.schedule_meta_file, self.dm.load_schedule_meta, lambda v: v),
+            "best_schedule": (self.dm.best_schedule_file, self.dm.load_best_schedule, lambda v: v),
+            "profile": (self.dm.profile_file, self.dm.load_profile, lambda v: v),
+        }
+
+    def _load_students(self):
+        students = self.dm.load_students()
+        return students, {s.id: s for s in students}
+
+    def _load_companies(self):
+        companies = self.dm.load_companies()
+        return companies, {c.id: c for c in companies}
+
+    @classmethod
+    def _stamp(cls, path) -> Any:
+        if isinstance(path, tuple):
+            return tuple(cls._stamp(p) for p in path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _get(self, name: str) -> _Entry:
+        path, loader, _ = self.sources[name]
+        stamp = self._stamp(path)
+        entry = self.entries.get(name)
+        if entry is not None and entry.stamp == stamp:
+            return entry
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None or entry.stamp != stamp:
+                entry = _Entry(stamp, loader())
+                self.entries[name] = entry
+            return entry
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drops cached data (one dataset, or everything) after a write."""
+        with self.lock:
+            if name is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(name, None)
+
+    # --- Parsed data ---
+
+    def students(self) -> List[Student]:
+        return self._get("students").value[0]
+
+    def students_by_id(self) -> Dict[str, Student]:
+        return self._get("students").value[1]
+
+    def companies(self) -> List[Company]:
+        return self._get("companies").value[0]
+
+    def companies_by_id(self) -> Dict[str, Company]:
+        return self._get("companies").value[1]
+
+    def interviews(self) -> List[Interview]:
+        return self._get("schedule").value
+
+    def schedule_meta(self) -> Dict:
+        return self._get("schedule_meta").value
+
+    def _derived(self, name: str, key: str, build: Callable[[Any], Any]) -> Any:
+        entry = self._get(name)
+        if key not in entry.derived:
+            with self.lock:
+                if key not in entry.derived:
+                    entry.derived[key] = build(entry.value)
+        return entry.derived[key]
+
+    # --- Interview indexes (sorted by start time) ---
+
+    def interviews_by_company(self) -> Dict[str, List[Interview]]:
+        return self._derived("schedule", "by_company", lambda v: _group_sorted(v, "company_id"))
+
+    def interviews_by_student(self) -> Dict[str, List[Interview]]:
+        return self._derived("schedule", "by_student", lambda v: _group_sorted(v, "student_id"))
+
+    def interviews_sorted_by_company(self) -> List[Interview]:
+        return self._derived("schedule", "sorted_by_company",
+                             lambda v: sorted(v, key=lambda i: (i.company_id, i.start)))
+
+    def interviews_sorted_by_student(self) -> List[Interview]:
+        return self._derived("schedule", "sorted_by_student",
+                             lambda v: sorted(v, key=lambda i: (i.student_id, i.start)))
+
+    # --- Single-student and single-company views ---
+
+    def student_schedule(self, student_id: str) -> Tuple[List[Interview], Dict[str, Student]]:
+        """
+        One student's interviews (by start) and a students-by-id dict that
+        covers them. On SQLite both come from indexed queries, so a single
+        export does not load the whole dataset.
+        """
+        if hasattr(self.dm, "interviews_for_student"):
+            student = self.dm.load_student(student_id)
+            return self.dm.interviews_for_student(student_id), {student_id: student} if student else {}
+        return self.interviews_by_student().get(student_id, []), self.students_by_id()
+
+    def company_schedule(self, company_id: str) -> Tuple[List[Interview], Dict[str, Student]]:
+        """One company's interviews (by start) and a students-by-id dict that covers them; see student_schedule."""
+        if hasattr(self.dm, "interviews_for_company"):
+            interviews = self.dm.interviews_for_company(company_id)
+            students = {}
+            for student_id in {i.student_id for i in interviews}:
+                student = self.dm.load_student(student_id)
+                if student is not None:
+                    students[student_id] = student
+            return interviews, students
+        return self.interviews_by_company().get(company_id, []), self.students_by_id()
+
+    # --- Encoded API responses ---
+
+    def json_bytes(self, name: str) -> bytes:
+        """The dataset encoded as a JSON response body, built once per reload."""
+        entry = self._get(name)
+        if entry.encoded is None:
+            with self.lock:
+                if entry.encoded is None:
+                    entry.encoded = json.dumps(self.sources[name][2](entry.value)).encode('utf-8')
+        return entry.encoded
+
+
+def _group_sorted(interviews: List[Interview], attr: str) -> Dict[str, List[Interview]]:
+    groups: Dict[str, List[Interview]] = {}
+    for i in interviews:
+        groups.setdefault(getattr(i, attr), []).append(i)
+    for group in groups.values():
+        group.sort(key=lambda i: i.start)
+    return groups
@@ -121,10 +121,4 @@ class ResponseImporter:
         self.dm.save_students(students)
         
         # Clear schedule
-        # Function to clear schedule? DataManager doesn't seem to have a clear_schedule method exposed in previous snippets.
-        # But `cli.py` might save interviews.
-        # I'll manually overwrite schedule file if I can access it.
-        schedule_file = self.dm.data_dir / "schedule.json"
-        if schedule_file.exists():
-             with open(schedule_file, 'w') as f:
-                 f.write("[]") # Empty list
+        self.dm.save_interviews([])
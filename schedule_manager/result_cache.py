@@ -0,0 +1,108 @@
+"""
+Content-addressed cache of solved schedules.
+
+Re-running the scheduler on unchanged data (a second click on "Generate
+Schedule", `cli.py schedule` after a no-op import) would redo the whole
+optimization. Instead, Scheduler.run hashes everything that determines the
+result - the filtered applications in order with their weights and
+statuses, the slot grid and the engine, formulation and solver settings -
+and looks the hash up here first.
+
+Each entry is one JSON file, `<key>.json`, under the data directory's
+`cache/` folder. Hits refresh the file's mtime, and once there are more than
+`max_entries` files the least recently used ones are deleted. Entries are
+only ever written whole (temp file + rename), so a reader never sees a
+partial file; an unreadable entry counts as a miss.
+
+Warm-start hints and the number of worker processes only change how fast a
+result is found, so they are not part of the key.
+"""
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from schedule_manager.data_manager import Application, datetime_to_epoch
+from schedule_manager.problem import Problem
+
+# Bump when the entry layout or the meaning of a key changes
+CACHE_VERSION = 3
+DEFAULT_MAX_ENTRIES = 32
+
+
+def input_context(slots, engine: str, formulation: str, settings) -> str:
+    """Canonical form of everything but the applications: slot grid, engine, formulation, settings."""
+    return json.dumps({
+        "version": CACHE_VERSION,
+        "slots": [datetime_to_epoch(s) for s in slots],
+        "engine": engine,
+        "formulation": formulation,
+        "settings": asdict(settings),
+    }, sort_keys=True)
+
+
+def app_lines(problem: Problem, valid_apps: List[Application]) -> List[str]:
+    """One canonical line per application (problem index): ids, weight and status."""
+    return [f"{app.student_id}\x1f{app.company_id}\x1f{app.job_role_id}\x1f{w}\x1f{st}\n"
+            for app, w, st in zip(valid_apps, problem.weight, problem.status)]
+
+
+def input_key(context: str, lines: List[str]) -> str:
+    """sha256 of the canonical scheduling input (see the module docstring)."""
+    # Application order matters: it fixes the interview IDs
+    return hashlib.sha256((context + "".join(lines)).encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)  # most recently used
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                pass
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> int:
+        """Deletes every entry; returns how many there were."""
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
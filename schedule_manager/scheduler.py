@@ -1,6 +1,12 @@
+from array import array
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime, timedelta
-from typing import List, Dict, Set, Tuple, Optional
+from functools import partial
+from typing import Any, Callable, List, Dict, Set, Tuple, Optional, Sequence
+import re
 import sys
+import threading
+import time
 
 # Try importing OR-Tools
 try:
@@ -9,19 +15,109 @@ try:
 except ImportError:
     ORTOOLS_AVAILABLE = False
 
-from schedule_manager.data_manager import DataManager, Student, Company, Application, Interview, AppStatus
+from schedule_manager.data_manager import DataManager, Application, Interview, AppStatus, datetime_to_epoch
+from schedule_manager import flow_scheduler, greedy_scheduler, decomposition, presolve
+from schedule_manager.engines import AUTO, ENGINES, Engine, InstanceStats, get_engine, register_engine, select_engine
+from schedule_manager.decomposition import ComponentMemo, SolveResult, SolutionFn
+from schedule_manager.problem import Problem, STATUS_CODES
+from schedule_manager.profiling import Profiler
+from schedule_manager.result_cache import ResultCache, app_lines, input_context, input_key
+
+# Length of one interview slot; every interview takes exactly one
+SLOT_MINUTES = 30
+
+# Minimum seconds between writes of the best-so-far schedule during a solve
+BEST_SCHEDULE_INTERVAL = 1.0
+
+# Statuses considered for optimization
+SCHEDULABLE_STATUSES = (AppStatus.APPLIED, AppStatus.SHORTLISTED, AppStatus.WAITLISTED)
+
+# Valid values of the bounded settings: (check, description for errors)
+SETTING_RANGES: Dict[str, Tuple[Callable[[Any], bool], str]] = {
+    "max_time_in_seconds": (lambda v: v > 0, "> 0"),
+    "num_search_workers": (lambda v: v >= 0, ">= 0"),
+    "relative_gap_limit": (lambda v: 0 <= v < 1, ">= 0 and < 1"),
+}
+
+@dataclass
+class SolverSettings:
+    """CP-SAT search budget. None keeps the solver's default."""
+    max_time_in_seconds: Optional[float] = None  # wall-clock budget for the whole run
+    num_search_workers: Optional[int] = None
+    relative_gap_limit: Optional[float] = None  # stop once (bound - objective) / bound <= limit
+    random_seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SolverSettings":
+        """
+        Builds settings from e.g. an API request body, ignoring unknown keys.
+        Raises ValueError for a value of the wrong type or out of range.
+        """
+        casts = {"max_time_in_seconds": float, "num_search_workers": int,
+                 "relative_gap_limit": float, "random_seed": int}
+        values = {}
+        for f in fields(cls):
+            if data.get(f.name) is not None:
+                try:
+                    values[f.name] = casts[f.name](data[f.name])
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid {f.name}: {data[f.name]!r}") from None
+                if f.name in SETTING_RANGES:
+                    check, rule = SETTING_RANGES[f.name]
+                    if not check(values[f.name]):
+                        raise ValueError(f"Invalid {f.name}: {data[f.name]!r} (must be {rule})")
+        return cls(**values)
+
+    def apply(self, params, deadline: Optional[float] = None):
+        """Copies the settings onto CpSolver.parameters."""
+        if self.max_time_in_seconds is not None:
+            remaining = self.max_time_in_seconds
+            if deadline is not None:
+                # Components share one budget; later ones get what is left
+                remaining = deadline - time.time()
+            params.max_time_in_seconds = max(0.1, remaining)
+        if self.num_search_workers is not None:
+            params.num_search_workers = self.num_search_workers
+        if self.relative_gap_limit is not None:
+            params.relative_gap_limit = self.relative_gap_limit
+        if self.random_seed is not None:
+            params.random_seed = self.random_seed
+
+def application_weight(app: Application) -> int:
+    """Objective weight of scheduling an application (shared by every engine)."""
+    # Base weight
+    weight = 10
+    
+    # Boost for Shortlisted
+    if app.status == AppStatus.SHORTLISTED:
+        weight += 20
+    
+    # Boost for Priority (if it exists, lower is better. 1=High)
+    if app.priority:
+        # 1->5, 2->4, 3->3, etc.
+        weight += (6 - app.priority)
+    return weight
 
 class Scheduler:
-    def __init__(self, data_manager: DataManager):
+    def __init__(self, data_manager: DataManager, profile_memory: bool = False):
         self.dm = data_manager
-        self.students = self.dm.load_students()
-        self.companies = self.dm.load_companies()
+        # Wall time (and with profile_memory, tracemalloc peak) of every phase
+        self.profiler = Profiler(memory=profile_memory)
+        # Solved schedules by input hash, so an unchanged input is not re-solved
+        self.cache = ResultCache(data_manager.data_dir / "cache")
+        with self.profiler.phase("load"):
+            self.students = self.dm.load_students()
+            self.companies = self.dm.load_companies()
         self.interviews: List[Interview] = []
+        # Summary of the last run() (settings, status, objective, gap), saved with the schedule
+        self.run_info: Dict[str, Any] = {}
+        # Per-component solutions of the last run, saved with its schedule (see ComponentMemo)
+        self.component_solutions: Optional[Dict[str, Any]] = None
         
         # Maps to track availability (if we were preserving state, but optimization usually rebuilds)
         # For this implementation, we assume run() builds from scratch for the given day
         
-    def generate_slots(self, date_str: str, start_hour: int = 9, end_hour: int = 17, duration_minutes: int = 30) -> List[datetime]:
+    def generate_slots(self, date_str: str, start_hour: int = 9, end_hour: int = 17, duration_minutes: int = SLOT_MINUTES) -> List[datetime]:
         """Generates a list of start times for a given day."""
         slots = []
         current = datetime.strptime(f"{date_str} {start_hour}:00", "%Y-%m-%d %H:%M")
@@ -32,144 +128,708 @@ class Scheduler:
             current += timedelta(minutes=duration_minutes)
         return slots
 
-    def run(self, event_date: str = "2026-02-20") -> List[Interview]:
-        if not ORTOOLS_AVAILABLE:
-            print("ERROR: OR-Tools not installed. Please run 'pip install ortools'.")
-            return []
+    def compile_problem(self, num_slots: int) -> Tuple[Problem, List[Application]]:
+        """
+        One pass over the loaded students: returns the array-backed Problem of
+        every application that takes part in optimization, plus those
+        Application objects in the same order (problem index i <-> valid_apps[i]).
+        Students and companies are numbered by the data manager's ID registry.
+        """
+        ids = self.dm.ids
+        student_index, company_index = ids.students.index, ids.companies.index
+        known_company = bytearray(len(ids.companies))
+        for c in self.companies:
+            known_company[company_index[c.id]] = 1
 
-        print(f"Starting OR-Tools optimization for {event_date}...")
-        
-        # 1. Prepare Data
-        slots = self.generate_slots(event_date)
-        num_slots = len(slots)
-        
-        # Flatten applications to schedule
-        # List of (Student, Application, Company)
-        valid_apps = []
-        
-        # For lookup
-        company_map = {c.id: c for c in self.companies}
-        
+        valid_apps: List[Application] = []
+        student, company, weight, status = array("i"), array("i"), array("i"), array("b")
+        skipped = 0
         for s in self.students:
+            s_idx = student_index[s.id]
             for app in s.applications:
                 # We consider APPLIED, SHORTLISTED, and WAITLISTED for optimization
                 # (Assuming we want to schedule as many as possible given constraints)
-                if app.status in [AppStatus.APPLIED, AppStatus.SHORTLISTED, AppStatus.WAITLISTED]:
-                    valid_apps.append({
-                        "student": s,
-                        "app": app,
-                        "company": company_map[app.company_id]
-                    })
+                if app.status not in SCHEDULABLE_STATUSES:
+                    continue
+                c_idx = company_index[app.company_id]
+                if c_idx >= len(known_company) or not known_company[c_idx]:
+                    skipped += 1
+                    continue
+                valid_apps.append(app)
+                student.append(s_idx)
+                company.append(c_idx)
+                weight.append(application_weight(app))
+                status.append(STATUS_CODES[AppStatus(app.status)])
+        if skipped:
+            print(f"  Warning: skipped {skipped} applications to unknown companies.")
 
-        print(f"  Found {len(valid_apps)} potential interviews to schedule across {num_slots} slots.")
+        problem = Problem(num_slots, len(ids.students), len(ids.companies), student, company, weight, status)
+        return problem, valid_apps
 
-        # 2. Build Model
-        model = cp_model.CpModel()
-        
-        # Variables: x[app_index, slot_index]
-        # 1 if valid_apps[i] is scheduled at slot[j], 0 otherwise
-        x = {}
-        
-        for i, item in enumerate(valid_apps):
-            for t in range(num_slots):
-                x[(i, t)] = model.NewBoolVar(f'app_{i}_slot_{t}')
+    def previous_slot_hints(self, problem: Problem, valid_apps: List[Application],
+                            slots: List[datetime]) -> Dict[int, int]:
+        """
+        Reads the saved schedule and maps each problem index to the slot its
+        application had last time, keyed on (student, company, role, slot).
+        Interviews from another day or for withdrawn applications are ignored.
+        """
+        ids = self.dm.ids
+        slot_index = {datetime_to_epoch(slot): t for t, slot in enumerate(slots)}
+        previous = {}
+        for interview in self.dm.load_interviews():  # registers any new IDs
+            t = slot_index.get(interview.start)
+            if t is not None:
+                key = (ids.students.index[interview.student_id], ids.companies.index[interview.company_id],
+                       ids.roles.index[interview.job_role_id])
+                previous[key] = t
+
+        hints = {}
+        role_index = ids.roles.index
+        for i, app in enumerate(valid_apps):
+            key = (problem.student[i], problem.company[i], role_index[app.job_role_id])
+            if key in previous:
+                hints[i] = previous[key]
+        return hints
 
-        # Constraints
+    def run(self, event_date: str = "2026-02-20", engine: str = AUTO, workers: Optional[int] = None,
+            warm_start: bool = False, formulation: str = "compact",
+            settings: Optional[SolverSettings] = None,
+            on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+            stop=None, use_cache: bool = True) -> List[Interview]:
+        """
+        Schedules all valid applications for the given day.
+
+        engine: a registered engine name (see engines.ENGINES: "cp-sat",
+        "flow", ...) or "auto" to pick one from the instance statistics. All
+        engines maximize the same objective.
+        workers: processes used to solve independent components (default: all cores).
+        warm_start: seed engines that support it (cp-sat, greedy) with the saved
+        schedule.json as solution hints.
+        formulation: CP-SAT model builder, "compact" or "classic".
+        settings: CP-SAT time limit, workers, gap limit and seed.
+        on_progress: receives progress events ({"phase": ..., ...}) while running,
+        including improving solutions (objective, bound, gap, wall time).
+        stop: an Event (threading or multiprocessing); setting it accepts the
+        best schedule found so far. Components the search has not solved yet
+        are then scheduled with the flow engine, so the accepted schedule
+        still covers every component.
+        use_cache: return the cached schedule if the same input (applications,
+        slots, engine, formulation, settings) was solved before, and cache
+        this run's result otherwise (see result_cache). run_info["cached"]
+        tells which happened. Otherwise, components of the application graph
+        that are unchanged since the saved schedule keep their solutions and
+        only the others are solved (run_info["components_reused"]).
+
+        The best schedule so far is also written to the data manager's best
+        schedule (see save_best_schedule) as the search improves it.
+        """
+        settings = settings or SolverSettings()
+        report = on_progress or (lambda event: None)
+        requested = engine
+        if engine != AUTO:
+            if not get_engine(engine).available():
+                print(f"ERROR: The {engine} engine is not available here "
+                      f"(OR-Tools not installed?). Use --engine auto or install it with 'pip install ortools'.")
+                return []
+
+        print(f"Starting {engine} optimization for {event_date}...")
+        start = time.time()
+        deadline = start + settings.max_time_in_seconds if settings.max_time_in_seconds else None
         
-        # C1: Each application scheduled at most once
-        for i in range(len(valid_apps)):
+        profiler = self.profiler
+        # 1. Prepare Data
+        with profiler.phase("compile"):
+            slots = self.generate_slots(event_date)
+            num_slots = len(slots)
+
+            # Flatten applications to schedule
+            problem, valid_apps = self.compile_problem(num_slots)
+
+        print(f"  Found {len(valid_apps)} potential interviews to schedule across {num_slots} slots.")
+        report({"phase": "preparing", "applications": len(valid_apps), "slots": num_slots})
+
+        cache_key = memo = None
+        self.component_solutions = None
+        if use_cache:
+            with profiler.phase("cache"):
+                context, lines = input_context(slots, requested, formulation, settings), app_lines(problem, valid_apps)
+                cache_key = input_key(context, lines)
+                entry = self.cache.get(cache_key)
+                if entry is None:
+                    previous = ComponentMemo.load(self.dm.load_component_solutions())
+                    memo = ComponentMemo(context, lines, previous)
+            if entry is not None:
+                return self._run_cached(entry, valid_apps, slots, start, report)
+
+        # 2. Solve each connected component independently.
+        # assignment maps problem (= valid_apps) index -> slot index
+        # Presolve: applications that can always be scheduled skip selection
+        with profiler.phase("presolve"):
+            kernel = presolve.kernelize(problem)
+        print(f"  {kernel.summary()}")
+
+        stats = InstanceStats(
+            applications=len(problem),
+            core=len(kernel.core),
+            oversubscribed_students=kernel.oversubscribed_students,
+            oversubscribed_companies=kernel.oversubscribed_companies,
+        )
+        reason = None
+        if engine == AUTO:
+            engine, reason = select_engine(stats, exact=not settings.relative_gap_limit)
+            print(f"  Auto-selected the {engine} engine: {reason}.")
+        chosen = get_engine(engine)
+
+        hints = None
+        if warm_start and chosen.warm_start:
+            with profiler.phase("hints"):
+                hints = self.previous_slot_hints(problem, valid_apps, slots)
+            print(f"  Warm start: {len(hints)} hints from the previous schedule.")
+
+        # stop is handed over by solve_components, which keeps it out of the pickled solve_fn
+        options = {"formulation": formulation, "settings": settings, "deadline": deadline}
+        solve_fn = partial(chosen.solve, **{k: v for k, v in options.items() if k in chosen.options})
+        trajectory: List[Dict[str, Any]] = []
+        last_saved = [0.0]
+
+        def component_progress(best: SolveResult, components_done: int):
+            point = {
+                "objective": best.objective,
+                "best_bound": best.best_bound,
+                "gap": round(best.gap, 6),
+                "wall_time": round(time.time() - start, 3),
+                "components_done": components_done,
+            }
+            if not trajectory or best.objective > trajectory[-1]["objective"]:
+                trajectory.append(point)
+                # Throttled: a large model may report many solutions a second
+                if time.time() - last_saved[0] >= BEST_SCHEDULE_INTERVAL:
+                    self._save_best(best.assignment, valid_apps, slots, point)
+                    last_saved[0] = time.time()
+            report({"phase": "solving", "best_objective": best.objective, **point})
+
+        def solve_all(solve_fn, memo) -> Tuple[SolveResult, int]:
+            try:
+                return decomposition.solve_components(
+                    solve_fn, problem, max_workers=workers, hints=hints, fixed=set(kernel.fixed),
+                    on_progress=component_progress, stop=stop, memo=memo, fallback_fn=solve_flow,
+                    pass_stop="stop" in chosen.options
+                )
+            except RuntimeError:
+                # A component has no solution: nothing of this run is kept, not
+                # even the partial best schedule written while it was solving
+                self.dm.save_best_schedule({})
+                raise
+
+        report({"phase": "solving", "fixed_by_presolve": len(kernel.fixed)})
+        with profiler.phase("solve"):
+            result, num_components = solve_all(solve_fn, memo)
+        reused = memo.reused if memo else 0
+        accepted_early = stop is not None and stop.is_set()
+        limit = settings.relative_gap_limit
+        if requested == AUTO and not chosen.exact and limit and result.gap > limit and not accepted_early:
+            # The heuristic bound could not certify the requested gap
+            exact_engine = next((e for e in sorted(ENGINES.values(), key=lambda e: e.speed)
+                                 if e.exact and e.available()), None)
+            if exact_engine:
+                print(f"  {engine} gap {result.gap:.2%} exceeds the {limit:.2%} limit; "
+                      f"re-solving with the {exact_engine.name} engine.")
+                engine, chosen = exact_engine.name, exact_engine
+                reason = f"{reason}; the heuristic missed the gap limit"
+                solve_fn = partial(chosen.solve, **{k: v for k, v in options.items() if k in chosen.options})
+                # Everything is re-solved, reused components included
+                memo = ComponentMemo(memo.context, memo.lines) if memo else None
+                with profiler.phase("resolve"):
+                    result, num_components = solve_all(solve_fn, memo)
+                reused = 0
+                accepted_early = stop is not None and stop.is_set()
+        if accepted_early:
+            print("  Search stopped early; keeping the best schedule found so far.")
+        report({"phase": "extracting", "best_objective": result.objective})
+        print(f"  Solved {num_components} independent components.")
+        if reused:
+            print(f"  Reused {reused} of them unchanged since the last run; re-solved {num_components - reused}.")
+
+        # 3. Build interviews (in application order, so IDs are stable)
+        profiler.add_engine_stats(result.stats)
+        with profiler.phase("extract"):
+            self.interviews = self.build_interviews(result.assignment, valid_apps, slots)
+            if reused:
+                self._keep_interview_ids(self.interviews)
+        count = len(self.interviews)
+        final = {"objective": result.objective, "best_bound": result.best_bound, "gap": round(result.gap, 6),
+                 "wall_time": round(time.time() - start, 3), "components_done": num_components}
+        if not trajectory or result.objective > trajectory[-1]["objective"]:
+            trajectory.append(final)
+        with profiler.phase("save_best"):
+            self._save_best(result.assignment, valid_apps, slots, {**final, "status": result.status},
+                            self.interviews)
+
+        print(f"  Optimization found {count} interviews.")
+        print(f"  Objective Value: {result.objective} (bound {result.best_bound}, gap {result.gap:.2%}, {result.status})")
+
+        self.run_info = {
+            "event_date": event_date,
+            "engine": engine,
+            "engine_requested": requested,
+            "engine_reason": reason,
+            "instance": stats.to_dict(),
+            "formulation": formulation if "formulation" in chosen.options else None,
+            "settings": asdict(settings),
+            "status": result.status,
+            "objective": result.objective,
+            "best_bound": result.best_bound,
+            "gap": result.gap,
+            "interviews": count,
+            "applications": len(valid_apps),
+            "fixed_by_presolve": len(kernel.fixed),
+            "components": num_components,
+            "components_reused": reused,
+            "accepted_early": accepted_early,
+            "cached": False,
+            "trajectory": trajectory,
+            "wall_time": round(time.time() - start, 3),
+        }
+        if cache_key and not accepted_early:
+            # Every component has a solution here (solve_components raises otherwise), but an
+            # accepted-early schedule is whatever the search had reached; don't replay it
+            with profiler.phase("cache"):
+                self._cache_result(cache_key, result)
+                self.component_solutions = memo.to_dict()
+        self.run_info["profile"] = profiler.report()
+        return self.interviews
+
+    def _cache_result(self, key: str, result: SolveResult):
+        info = {k: v for k, v in self.run_info.items()
+                if k not in ("accepted_early", "cached", "components_reused", "trajectory", "wall_time")}
+        try:
+            # The IDs too: a partly re-solved schedule keeps the ones spliced in by _keep_interview_ids
+            self.cache.put(key, {"assignment": sorted(result.assignment.items()),
+                                 "interview_ids": [i.id for i in self.interviews], "run_info": info})
+        except OSError as e:
+            print(f"  Warning: could not cache the result: {e}")
+
+    def _keep_interview_ids(self, interviews: List[Interview]):
+        """
+        Splices a partly re-solved schedule into the saved one: interviews
+        unchanged from it keep their IDs, new ones are numbered after the
+        highest saved ID.
+        """
+        previous = {(i.student_id, i.company_id, i.job_role_id, i.start): i.id for i in self.dm.load_interviews()}
+        numbers = [int(m.group(1)) for m in (re.fullmatch(r"INT-(\d+)", v) for v in previous.values()) if m]
+        next_number = max(numbers, default=0) + 1
+        for interview in interviews:
+            old = previous.get((interview.student_id, interview.company_id, interview.job_role_id, interview.start))
+            if old is not None:
+                interview.id = old
+            else:
+                interview.id = f"INT-{next_number}"
+                next_number += 1
+
+    def _run_cached(self, entry: Dict[str, Any], valid_apps: List[Application], slots: List[datetime],
+                    start: float, report: Callable[[Dict[str, Any]], None]) -> List[Interview]:
+        """Rebuilds the schedule of a cache hit, with its interview IDs: no presolve, no solve."""
+        info = entry["run_info"]
+        print(f"  Input unchanged since a previous run; using its cached {info['engine']} schedule.")
+        report({"phase": "extracting", "best_objective": info["objective"], "cached": True})
+        with self.profiler.phase("extract"):
+            self.interviews = self.build_interviews(dict(entry["assignment"]), valid_apps, slots)
+            for interview, interview_id in zip(self.interviews, entry["interview_ids"]):
+                interview.id = interview_id
+        final = {"objective": info["objective"], "best_bound": info["best_bound"], "gap": round(info["gap"], 6),
+                 "wall_time": round(time.time() - start, 3), "components_done": info["components"]}
+        with self.profiler.phase("save_best"):
+            self._save_best({}, valid_apps, slots, {**final, "status": info["status"]}, self.interviews)
+
+        print(f"  Optimization found {len(self.interviews)} interviews.")
+        print(f"  Objective Value: {info['objective']} (bound {info['best_bound']}, gap {info['gap']:.2%}, "
+              f"{info['status']}, cached)")
+        self.run_info = {
+            **info,
+            "components_reused": info["components"],
+            "accepted_early": False,
+            "cached": True,
+            "trajectory": [final],
+            "wall_time": round(time.time() - start, 3),
+            "profile": self.profiler.report(),
+        }
+        return self.interviews
+
+    def save_results(self):
+        """Saves the schedule, its meta and component sidecars and the profile sidecar (including the save itself)."""
+        with self.profiler.phase("save"):
+            self.dm.save_interviews(self.interviews)
+            self.dm.save_schedule_meta({k: v for k, v in self.run_info.items() if k != "profile"})
+            if self.component_solutions is not None:
+                self.dm.save_component_solutions(self.component_solutions)
+        self.run_info["profile"] = self.profiler.report()
+        self.dm.save_profile(self.run_info["profile"])
+
+    def build_interviews(self, assignment: Dict[int, int], valid_apps: List[Application],
+                         slots: List[datetime]) -> List[Interview]:
+        """
+        Interviews for an assignment (problem index -> slot), numbered in
+        application order. Slot starts are converted to epoch seconds once,
+        so each interview is one integer lookup.
+        """
+        slot_epochs = [datetime_to_epoch(s) for s in slots]
+        slot_seconds = SLOT_MINUTES * 60
+        scheduled = [(valid_apps[i], slot_epochs[t]) for i, t in sorted(assignment.items())]
+        return [
+            Interview(
+                id=f"INT-{n}",
+                student_id=app.student_id,
+                company_id=app.company_id,
+                job_role_id=app.job_role_id,
+                start=start,
+                end=start + slot_seconds,
+            )
+            for n, (app, start) in enumerate(scheduled, 1)
+        ]
+
+    def _save_best(self, assignment: Dict[int, int], valid_apps: List[Application], slots: List[datetime],
+                   point: Dict[str, Any], interviews: Optional[List[Interview]] = None):
+        if interviews is None:
+            interviews = self.build_interviews(assignment, valid_apps, slots)
+        self.dm.save_best_schedule({**point, "interviews": [i.to_dict() for i in interviews]})
+
+
+def solve_flow(problem: Problem,
+               hints: Optional[Dict[int, int]] = None,
+               fixed: Optional[Set[int]] = None,
+               on_solution: Optional[SolutionFn] = None) -> SolveResult:
+    """Exact min-cost-flow + edge colouring solve (see flow_scheduler)."""
+    assignment, objective = flow_scheduler.solve(problem, fixed)
+    return SolveResult(assignment, float(objective), float(objective), "OPTIMAL")
+
+
+def solve_greedy(problem: Problem,
+                 hints: Optional[Dict[int, int]] = None,
+                 fixed: Optional[Set[int]] = None,
+                 on_solution: Optional[SolutionFn] = None,
+                 deadline: Optional[float] = None,
+                 stop=None) -> SolveResult:
+    """Pure-Python greedy + local search (see greedy_scheduler); no optimality proof."""
+    report = None
+    if on_solution:
+        bound = greedy_scheduler.upper_bound(problem)
+        report = lambda assignment, objective: on_solution(
+            SolveResult(assignment, float(objective), float(bound), "FEASIBLE"))
+    assignment, objective, bound = greedy_scheduler.solve(problem, fixed, hints, deadline, report, stop)
+    return SolveResult(assignment, float(objective), float(bound),
+                       "OPTIMAL" if objective == bound else "FEASIBLE")
+
+
+# (model, x[i][t] BoolVars, per-app slot IntVars or None)
+ModelVars = Tuple["cp_model.CpModel", List[List["cp_model.IntVar"]], Optional[List["cp_model.IntVar"]]]
+
+
+def build_classic_model(problem: Problem,
+                        fixed: Optional[Set[int]] = None) -> ModelVars:
+    """
+    Original formulation: one named BoolVar per (application, slot) and
+    `sum(...) <= 1` constraints built from Python generators.
+    Applications in `fixed` must be scheduled exactly once.
+    Returns (model, x, None) with x[i][t] the BoolVar of app i in slot t;
+    there are no slot variables, so solutions are read by scanning x.
+    """
+    fixed = fixed or set()
+    num_slots = problem.num_slots
+    apps = list(problem)
+    model = cp_model.CpModel()
+    
+    # Variables: x[app_index, slot_index]
+    # 1 if apps[i] is scheduled at slot[j], 0 otherwise
+    x = {}
+    
+    for i in range(len(apps)):
+        for t in range(num_slots):
+            x[(i, t)] = model.NewBoolVar(f'app_{i}_slot_{t}')
+
+    # Constraints
+    
+    # C1: Each application scheduled at most once (exactly once if fixed by presolve)
+    for i in range(len(apps)):
+        if i in fixed:
+            model.Add(sum(x[(i, t)] for t in range(num_slots)) == 1)
+        else:
             model.Add(sum(x[(i, t)] for t in range(num_slots)) <= 1)
-            
-        # C2: Student can have at most 1 interview per slot
-        # Group apps by student
-        apps_by_student = {}
-        for i, item in enumerate(valid_apps):
-            s_id = item["student"].id
-            if s_id not in apps_by_student: apps_by_student[s_id] = []
-            apps_by_student[s_id].append(i)
-            
-        for s_id, app_indices in apps_by_student.items():
-            for t in range(num_slots):
-                model.Add(sum(x[(i, t)] for i in app_indices) <= 1)
-
-        # C3: Company can have at most 1 interview per slot (Assuming 1 panel per company for now)
-        # If companies have multiple roles/panels, we might handle this differently, 
-        # but safe assumption is 1 slot = 1 interview for the company entity.
-        apps_by_company = {}
-        for i, item in enumerate(valid_apps):
-            c_id = item["company"].id
-            if c_id not in apps_by_company: apps_by_company[c_id] = []
-            apps_by_company[c_id].append(i)
-            
-        for c_id, app_indices in apps_by_company.items():
-            for t in range(num_slots):
-                model.Add(sum(x[(i, t)] for i in app_indices) <= 1)
-
-        # Objective: Maximize total scheduled interviews
-        # Weighting:
-        # - Shortlisted apps could have higher weight?
-        # - Earlier slots could have tiny positive weight to compact schedule?
         
-        objective_terms = []
-        for i, item in enumerate(valid_apps):
-            app = item["app"]
-            
-            # Base weight
-            weight = 10
-            
-            # Boost for Shortlisted
-            if app.status == AppStatus.SHORTLISTED:
-                weight += 20
-            
-            # Boost for Priority (if it exists, lower is better. 1=High)
-            if app.priority:
-                # 1->5, 2->4, 3->3, etc.
-                weight += (6 - app.priority)
-            
-            for t in range(num_slots):
-                objective_terms.append(x[(i, t)] * weight)
-
-        model.Maximize(sum(objective_terms))
-
-        # 3. Solve
-        solver = cp_model.CpSolver()
-        # solver.parameters.log_search_progress = True
-        status = solver.Solve(model)
-
-        print(f"  Solver Status: {solver.StatusName(status)}")
+    # C2: Student can have at most 1 interview per slot
+    # Group apps by student
+    apps_by_student = {}
+    for i, (s_id, _, _) in enumerate(apps):
+        if s_id not in apps_by_student: apps_by_student[s_id] = []
+        apps_by_student[s_id].append(i)
+        
+    for s_id, app_indices in apps_by_student.items():
+        for t in range(num_slots):
+            model.Add(sum(x[(i, t)] for i in app_indices) <= 1)
+
+    # C3: Company can have at most 1 interview per slot (Assuming 1 panel per company for now)
+    # If companies have multiple roles/panels, we might handle this differently, 
+    # but safe assumption is 1 slot = 1 interview for the company entity.
+    apps_by_company = {}
+    for i, (_, c_id, _) in enumerate(apps):
+        if c_id not in apps_by_company: apps_by_company[c_id] = []
+        apps_by_company[c_id].append(i)
         
-        self.interviews = []
-
-        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            count = 0
-            for i, item in enumerate(valid_apps):
-                for t in range(num_slots):
-                    if solver.BooleanValue(x[(i, t)]):
-                        # Scheduled!
-                        slot_start = slots[t]
-                        slot_end = slot_start + timedelta(minutes=30)
-                        
-                        student = item["student"]
-                        company = item["company"]
-                        app = item["app"]
-                        
-                        interview = Interview(
-                            id=f"INT-{count+1}",
-                            student_id=student.id,
-                            company_id=company.id,
-                            job_role_id=app.job_role_id,
-                            start_time=slot_start.isoformat(),
-                            end_time=slot_end.isoformat()
-                        )
-                        self.interviews.append(interview)
-                        count += 1
-                        
-            print(f"  Optimization found {count} interviews.")
-            print(f"  Objective Value: {solver.ObjectiveValue()}")
+    for c_id, app_indices in apps_by_company.items():
+        for t in range(num_slots):
+            model.Add(sum(x[(i, t)] for i in app_indices) <= 1)
+
+    # Objective: Maximize total scheduled interviews, weighted by application_weight()
+    objective_terms = []
+    for i, (_, _, weight) in enumerate(apps):
+        for t in range(num_slots):
+            objective_terms.append(x[(i, t)] * weight)
+
+    model.Maximize(sum(objective_terms))
+
+    return model, [[x[(i, t)] for t in range(num_slots)] for i in range(len(apps))], None
+
+
+def build_compact_model(problem: Problem,
+                        fixed: Optional[Set[int]] = None) -> ModelVars:
+    """
+    Same model as build_classic_model, built with native at-most-one
+    constraints and weighted sums instead of generator-built linear
+    expressions, driven by the problem's CSR adjacency. Each application
+    also gets a slot IntVar channelled to its BoolVars (start slot + 1, 0 if
+    unscheduled), so a solution is read with one value per application.
+    Applications in `fixed` must be scheduled exactly once.
+    Returns (model, x, slot) with x[i][t] the BoolVar of app i in slot t and
+    slot[i] its slot IntVar.
+    """
+    fixed = fixed or set()
+    num_slots = problem.num_slots
+    model = cp_model.CpModel()
+    slot_range = range(num_slots)
+
+    # Unnamed variables: names are only useful for debugging and cost memory
+    x = [[model.NewBoolVar("") for _ in slot_range] for _ in range(len(problem))]
+    slot = [model.NewIntVar(0, num_slots, "") for _ in x]
+
+    for i, row in enumerate(x):
+        # C1: each application in at most one slot (exactly one if fixed by
+        # presolve), channelled to slot[i]
+        if i in fixed:
+            model.AddExactlyOne(row)
         else:
-            print("  No solution found.")
+            model.AddAtMostOne(row)
+        model.Add(slot[i] == cp_model.LinearExpr.WeightedSum(row, range(1, num_slots + 1)))
 
-        return self.interviews
+    # C2/C3: one interview per slot per student and per company (CSR rows)
+    for ptr, members in ((problem.student_ptr, problem.student_apps), (problem.company_ptr, problem.company_apps)):
+        for r in range(len(ptr) - 1):
+            lo, hi = ptr[r], ptr[r + 1]
+            if hi - lo < 2:
+                continue
+            app_indices = members[lo:hi]
+            for t in slot_range:
+                model.AddAtMostOne([x[i][t] for i in app_indices])
+
+    weights = list(problem.weight)
+    model.Maximize(cp_model.LinearExpr.WeightedSum(
+        [cp_model.LinearExpr.Sum(row) for row in x], weights
+    ))
+    return model, x, slot
+
+
+class _AssignmentReader:
+    """
+    Reads {app index: start slot} from a solution's value array (the
+    response's `solution`, indexed by variable index). With slot variables
+    that is one value per application; otherwise every x[i][t] is scanned.
+    """
+
+    def __init__(self, x: List[List["cp_model.IntVar"]], slot: Optional[List["cp_model.IntVar"]]):
+        if slot is not None:
+            self.slot_index = [(i, var.Index()) for i, var in enumerate(slot)]
+            self.x_index = None
+        else:
+            self.slot_index = None
+            self.x_index = [[var.Index() for var in row] for row in x]
+
+    def read(self, values: Sequence[int]) -> Dict[int, int]:
+        assignment = {}
+        if self.slot_index is not None:
+            for i, k in self.slot_index:
+                v = values[k]
+                if v:
+                    assignment[i] = v - 1
+        else:
+            values = list(values)
+            for i, row in enumerate(self.x_index):
+                for t, k in enumerate(row):
+                    if values[k]:
+                        assignment[i] = t
+        return assignment
+
+
+class _SolutionCallback(cp_model.CpSolverSolutionCallback if ORTOOLS_AVAILABLE else object):
+    """Forwards each improving solution (assignment, objective, bound) found during the search."""
+
+    def __init__(self, reader: _AssignmentReader, on_solution: SolutionFn):
+        super().__init__()
+        self.reader = reader
+        self.on_solution = on_solution
+
+    def on_solution_callback(self):
+        assignment = self.reader.read(self.Response().solution)
+        self.on_solution(SolveResult(assignment, self.ObjectiveValue(), self.BestObjectiveBound(), "FEASIBLE"))
+
+
+class _PresolveTimer:
+    """CP-SAT log callback: presolve time is the gap between its start and the search start."""
+    PRESOLVE = re.compile(r"^Starting presolve at ([\d.]+)s")
+    SEARCH = re.compile(r"^Starting search at ([\d.]+)s")
+
+    def __init__(self):
+        self.presolve_start: Optional[float] = None
+        self.search_start: Optional[float] = None
+
+    def __call__(self, line: str):
+        if line.startswith("Starting "):
+            m = self.PRESOLVE.match(line)
+            if m:
+                self.presolve_start = float(m.group(1))
+            m = self.SEARCH.match(line)
+            if m:
+                self.search_start = float(m.group(1))
+
+    def seconds(self) -> float:
+        if self.presolve_start is None or self.search_start is None:
+            return 0.0
+        return self.search_start - self.presolve_start
+
+
+def _stop_on(stop, solver: "cp_model.CpSolver") -> threading.Event:
+    """Calls solver.StopSearch() once `stop` is set; set the returned Event when the solve is over."""
+    finished = threading.Event()
+
+    def watch():
+        while not finished.is_set():
+            if stop.wait(0.2):
+                solver.StopSearch()
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    return finished
+
+
+MODEL_BUILDERS = {
+    "classic": build_classic_model,
+    "compact": build_compact_model,
+}
+
+
+def solve_cp_sat(problem: Problem,
+                 hints: Optional[Dict[int, int]] = None,
+                 fixed: Optional[Set[int]] = None,
+                 on_solution: Optional[SolutionFn] = None,
+                 formulation: str = "compact",
+                 settings: Optional[SolverSettings] = None,
+                 deadline: Optional[float] = None,
+                 stop=None) -> Optional[SolveResult]:
+    """
+    Solves one (sub)problem with CP-SAT. If the search ends before its first
+    solution, the flow engine solves it instead; a model CP-SAT rejects
+    (e.g. MODEL_INVALID) raises RuntimeError.
+    hints (app index -> slot) are passed to the solver as a starting point.
+    fixed (app indices) must be scheduled; see presolve.kernelize.
+    formulation selects the model builder (see MODEL_BUILDERS).
+    on_solution is called with every improving solution.
+    settings/deadline bound the search (deadline is an absolute time.time()).
+    stop (an Event) ends the search early with the best solution found so far.
+    """
+    if fixed is not None and len(fixed) == len(problem):
+        # Nothing left to select: only the slot assignment remains, which
+        # edge colouring solves exactly without building a model.
+        return solve_flow(problem, fixed=fixed)
+
+    build_start = time.perf_counter()
+    model, x, slot = MODEL_BUILDERS[formulation](problem, fixed)
+    reader = _AssignmentReader(x, slot)
+
+    # Warm start: hint every variable so the solver starts from a complete assignment
+    if hints:
+        for i, row in enumerate(x):
+            hinted = hints.get(i)
+            for t, var in enumerate(row):
+                model.AddHint(var, 1 if t == hinted else 0)
+    build_s = time.perf_counter() - build_start
+
+    # Solve
+    solver = cp_model.CpSolver()
+    if settings:
+        settings.apply(solver.parameters, deadline)
+    # The search log is only read for the presolve time, not printed
+    presolve_timer = _PresolveTimer()
+    solver.parameters.log_search_progress = True
+    solver.parameters.log_to_stdout = False
+    solver.log_callback = presolve_timer
+    callback = _SolutionCallback(reader, on_solution) if on_solution else None
+    finished = _stop_on(stop, solver) if stop is not None else None
+    try:
+        status = solver.Solve(model, callback)
+    finally:
+        if finished is not None:
+            finished.set()
+
+    if status == cp_model.UNKNOWN:
+        # Out of time (or stopped) before the first solution: fall back to
+        # the exact flow engine rather than leave the component unscheduled.
+        print(f"  Solver Status: {solver.StatusName(status)}; falling back to the flow engine.")
+        return solve_flow(problem, fixed=fixed)
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        # The empty schedule is always feasible, so this is a bad model or bad parameters
+        raise RuntimeError(f"CP-SAT failed with status {solver.StatusName(status)}: "
+                           f"{solver.ResponseProto().solution_info or 'no details'}")
+
+    extract_start = time.perf_counter()
+    assignment = reader.read(solver.ResponseProto().solution)
+    proto = model.Proto()
+    stats = {
+        "build_model_s": build_s,
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "solve_s": solver.WallTime(),
+        "presolve_s": presolve_timer.seconds(),
+        "conflicts": solver.NumConflicts(),
+        "branches": solver.NumBranches(),
+        "extract_s": time.perf_counter() - extract_start,
+    }
+    return SolveResult(assignment, solver.ObjectiveValue(), solver.BestObjectiveBound(),
+                       "OPTIMAL" if status == cp_model.OPTIMAL else "FEASIBLE", stats)
+
+register_engine(Engine(
+    name="flow",
+    solve=solve_flow,
+    description="Min-cost flow selection + bipartite edge colouring; exact, no OR-Tools",
+    exact=True,
+    speed=1,
+))
+register_engine(Engine(
+    name="cp-sat",
+    solve=solve_cp_sat,
+    description="OR-Tools CP-SAT model; exact, supports warm starts",
+    exact=True,
+    requires_ortools=True,
+    warm_start=True,
+    speed=2,
+    options=("formulation", "settings", "deadline", "stop"),
+    is_available=lambda: ORTOOLS_AVAILABLE,
+))
+register_engine(Engine(
+    name="greedy",
+    solve=solve_greedy,
+    description="Greedy by priority + swap/augmenting local search on slot bitsets; heuristic, no OR-Tools",
+    exact=False,
+    warm_start=True,
+    speed=0,
+    options=("deadline", "stop"),
+))
 
 if __name__ == "__main__":
     from schedule_manager.data_manager import DataManager
@@ -183,5 +843,6 @@ if __name__ == "__main__":
     print("Running Scheduler Standalone...")
     dm = DataManager()
     scheduler = Scheduler(dm)
-    interviews = scheduler.run("2026-02-20")
+    engine = sys.argv[1] if len(sys.argv) > 1 else AUTO
+    interviews = scheduler.run("2026-02-20", engine=engine)
     print(f"Standalone execution finished. {len(interviews)} interviews scheduled.")
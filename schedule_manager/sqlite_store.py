@@ -0,0 +1,307 @@
+"""
+SQLite storage backend.
+
+SQLiteDataManager implements the same load_*/save_* interface as the JSON
+DataManager, on normalized tables (students, companies, roles, applications,
+interviews) indexed by student_id and company_id. On top of that it offers
+point updates and filtered queries, so editing one application or exporting
+one company's schedule does not deserialize the whole dataset.
+
+Enable it with SCHEDULE_BACKEND=sqlite (or `cli.py --backend sqlite`) after
+running `python3 cli.py migrate-sqlite` once to copy the JSON files over.
+"""
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from schedule_manager.data_manager import (
+    DataManager, Student, Company, JobRole, Application, Interview, AppStatus, ApplicationUpdate,
+    iso_to_epoch, epoch_to_iso
+)
+from schedule_manager.ids import IdRegistry
+from schedule_manager.journal import default_actor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS companies (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roles (
+    id TEXT PRIMARY KEY,
+    company_id TEXT NOT NULL REFERENCES companies(id),
+    title TEXT NOT NULL,
+    duration_minutes INTEGER NOT NULL DEFAULT 30
+);
+CREATE INDEX IF NOT EXISTS roles_company ON roles(company_id);
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    student_id TEXT NOT NULL REFERENCES students(id),
+    company_id TEXT NOT NULL,
+    job_role_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'applied',
+    priority INTEGER,
+    cv_link TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS applications_student ON applications(student_id);
+CREATE INDEX IF NOT EXISTS applications_company ON applications(company_id);
+CREATE TABLE IF NOT EXISTS interviews (
+    id TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    company_id TEXT NOT NULL,
+    job_role_id TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS interviews_student ON interviews(student_id, start_time);
+CREATE INDEX IF NOT EXISTS interviews_company ON interviews(company_id, start_time);
+CREATE TABLE IF NOT EXISTS audit (
+    id INTEGER PRIMARY KEY,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SQLiteDataManager:
+    def __init__(self, data_dir: str = "schedule_manager/data", db_name: str = "schedule.db"):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.db_file = self.data_dir / db_name
+        # Everything lives in one file; these keep callers that check or
+        # stat the data files (cli export, the server's Repository) working.
+        self.students_file = self.companies_file = self.db_file
+        self.schedule_file = self.schedule_meta_file = self.best_schedule_file = self.profile_file = self.db_file
+        self.components_file = self.db_file
+        self.ids = IdRegistry()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across server threads
+        conn = sqlite3.connect(self.db_file)
+        try:
+            with conn:  # commits, or rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    # --- Bulk interface (same as DataManager) ---
+
+    def save_students(self, students: List[Student]):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM applications")
+            conn.execute("DELETE FROM students")
+            conn.executemany("INSERT INTO students (id, name, email) VALUES (?, ?, ?)",
+                             [(s.id, s.name, s.email) for s in students])
+            conn.executemany(
+                "INSERT INTO applications (student_id, company_id, job_role_id, status, priority, cv_link) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(a.student_id, a.company_id, a.job_role_id, AppStatus(a.status).value, a.priority, a.cv_link)
+                 for s in students for a in s.applications])
+
+    def load_students(self) -> List[Student]:
+        with self._connect() as conn:
+            students = [Student(id=r[0], name=r[1], email=r[2])
+                        for r in conn.execute("SELECT id, name, email FROM students ORDER BY rowid")]
+            by_id = {s.id: s for s in students}
+            for row in conn.execute(
+                    "SELECT student_id, company_id, job_role_id, status, priority, cv_link "
+                    "FROM applications ORDER BY id"):
+                student = by_id.get(row[0])
+                if student is not None:
+                    student.applications.append(_application(row))
+        self.ids.add_students(students)
+        return students
+
+    def save_companies(self, companies: List[Company]):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM roles")
+            conn.execute("DELETE FROM companies")
+            conn.executemany("INSERT INTO companies (id, name) VALUES (?, ?)",
+                             [(c.id, c.name) for c in companies])
+            conn.executemany(
+                "INSERT INTO roles (id, company_id, title, duration_minutes) VALUES (?, ?, ?, ?)",
+                [(r.id, r.company_id, r.title, r.duration_minutes) for c in companies for r in c.job_roles])
+
+    def load_companies(self) -> List[Company]:
+        with self._connect() as conn:
+            companies = [Company(id=r[0], name=r[1])
+                         for r in conn.execute("SELECT id, name FROM companies ORDER BY rowid")]
+            by_id = {c.id: c for c in companies}
+            for r in conn.execute("SELECT id, title, company_id, duration_minutes FROM roles ORDER BY rowid"):
+                company = by_id.get(r[2])
+                if company is not None:
+                    company.job_roles.append(JobRole(id=r[0], title=r[1], company_id=r[2], duration_minutes=r[3]))
+        self.ids.add_companies(companies)
+        return companies
+
+    def save_interviews(self, interviews: List[Interview]):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM interviews")
+            conn.executemany(
+                "INSERT INTO interviews (id, student_id, company_id, job_role_id, start_time, end_time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(i.id, i.student_id, i.company_id, i.job_role_id, epoch_to_iso(i.start), epoch_to_iso(i.end))
+                 for i in interviews])
+
+    def load_interviews(self) -> List[Interview]:
+        with self._connect() as conn:
+            interviews = [_interview(r) for r in conn.execute(
+                "SELECT id, student_id, company_id, job_role_id, start_time, end_time FROM interviews ORDER BY rowid")]
+        self.ids.add_interviews(interviews)
+        return interviews
+
+    def save_schedule_meta(self, meta: Dict):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schedule', ?)", (json.dumps(meta),))
+
+    def load_schedule_meta(self) -> Dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schedule'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_profile(self, profile: Dict):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('profile', ?)", (json.dumps(profile),))
+
+    def load_profile(self) -> Dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'profile'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_component_solutions(self, components: Dict):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('components', ?)", (json.dumps(components),))
+
+    def load_component_solutions(self) -> Dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'components'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_best_schedule(self, best: Dict):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('best_schedule', ?)", (json.dumps(best),))
+
+    def load_best_schedule(self) -> Dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'best_schedule'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    # --- Point updates and filtered queries ---
+
+    def load_student(self, student_id: str) -> Optional[Student]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT id, name, email FROM students WHERE id = ?", (student_id,)).fetchone()
+            if row is None:
+                return None
+            student = Student(id=row[0], name=row[1], email=row[2])
+            student.applications = [_application(r) for r in conn.execute(
+                "SELECT student_id, company_id, job_role_id, status, priority, cv_link "
+                "FROM applications WHERE student_id = ? ORDER BY id", (student_id,))]
+        return student
+
+    def update_applications(self, updates: List[ApplicationUpdate],
+                            actor: Optional[str] = None) -> Tuple[int, List[ApplicationUpdate]]:
+        """
+        Applies many updates in one transaction, each as an indexed UPDATE,
+        and records them in the audit table.
+        Returns (applications changed, updates that matched nothing).
+        """
+        changed = 0
+        unmatched = []
+        ts = datetime.now().isoformat(timespec="seconds")
+        actor = actor or default_actor()
+        with self._connect() as conn:
+            for update in updates:
+                sets, params = [], []
+                if update.status is not None:
+                    sets.append("status = ?")
+                    params.append(AppStatus(update.status).value)
+                if update.priority is not None or update.clear_priority:
+                    sets.append("priority = ?")
+                    params.append(update.priority)
+                where = "student_id = ? AND company_id = ?"
+                params += [update.student_id, update.company_id]
+                if update.job_role_id:
+                    where += " AND job_role_id = ?"
+                    params.append(update.job_role_id)
+                if sets:
+                    rows = conn.execute(f"UPDATE applications SET {', '.join(sets)} WHERE {where}", params).rowcount
+                else:  # nothing to change, only report whether it matched
+                    rows = conn.execute(f"SELECT COUNT(*) FROM applications WHERE {where}", params).fetchone()[0]
+                if rows:
+                    changed += rows if sets else 0
+                    conn.execute("INSERT INTO audit (record) VALUES (?)",
+                                 (json.dumps(dict(update.to_record(), ts=ts, actor=actor)),))
+                else:
+                    unmatched.append(update)
+        return changed, unmatched
+
+    def update_application(self, student_id: str, company_id: str, job_role_id: Optional[str] = None,
+                           status: Optional[AppStatus] = None, priority: Optional[int] = None,
+                           clear_priority: bool = False, actor: Optional[str] = None) -> int:
+        """Updates one student's application(s) to a company. Returns the number changed."""
+        changed, _ = self.update_applications([ApplicationUpdate(
+            student_id, company_id, priority=priority, status=status,
+            job_role_id=job_role_id, clear_priority=clear_priority)], actor=actor)
+        return changed
+
+    def compact(self) -> int:
+        # Updates are applied in place; there is no journal to fold
+        return 0
+
+    def history(self, student_id: Optional[str] = None) -> List[Dict]:
+        with self._connect() as conn:
+            records = [json.loads(r[0]) for r in conn.execute("SELECT record FROM audit ORDER BY id")]
+        if student_id:
+            records = [r for r in records if r.get("student_id") == student_id]
+        return records
+
+    def interviews_for_student(self, student_id: str) -> List[Interview]:
+        with self._connect() as conn:
+            return [_interview(r) for r in conn.execute(
+                "SELECT id, student_id, company_id, job_role_id, start_time, end_time "
+                "FROM interviews WHERE student_id = ? ORDER BY start_time, rowid", (student_id,))]
+
+    def interviews_for_company(self, company_id: str) -> List[Interview]:
+        with self._connect() as conn:
+            return [_interview(r) for r in conn.execute(
+                "SELECT id, student_id, company_id, job_role_id, start_time, end_time "
+                "FROM interviews WHERE company_id = ? ORDER BY start_time, rowid", (company_id,))]
+
+
+def _application(row) -> Application:
+    return Application(student_id=row[0], company_id=row[1], job_role_id=row[2],
+                       status=AppStatus(row[3]), priority=row[4], cv_link=row[5])
+
+
+def _interview(row) -> Interview:
+    # Stored as ISO text (sortable, readable); held in memory as epoch seconds
+    return Interview(row[0], row[1], row[2], row[3], iso_to_epoch(row[4]), iso_to_epoch(row[5]))
+
+
+def migrate_from_json(data_dir: str = "schedule_manager/data") -> SQLiteDataManager:
+    """One-shot copy of students.json, companies.json and schedule.json into SQLite."""
+    source = DataManager(data_dir)
+    target = SQLiteDataManager(data_dir)
+    target.save_companies(source.load_companies())
+    target.save_students(source.load_students())
+    target.save_interviews(source.load_interviews())
+    target.save_schedule_meta(source.load_schedule_meta())
+    target.save_component_solutions(source.load_component_solutions())
+    with target._connect() as conn:
+        conn.execute("DELETE FROM audit")
+        conn.executemany("INSERT INTO audit (record) VALUES (?)", [(json.dumps(r),) for r in source.history()])
+    return target
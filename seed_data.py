@@ -1,8 +1,8 @@
 import random
-from schedule_manager.data_manager import DataManager, Student, Company, JobRole, Application, AppStatus
+from schedule_manager.data_manager import open_data_manager, Student, Company, JobRole, Application, AppStatus
 
 def seed():
-    dm = DataManager()
+    dm = open_data_manager()
     
     # 1. Create 16 Companies
     companies = []
@@ -2,24 +2,82 @@ import http.server
 import socketserver
 import json
 import os
-from urllib.parse import urlparse, parse_qs
-from dataclasses import asdict
+import threading
+from urllib.parse import urlparse
 
-from schedule_manager.data_manager import DataManager, Interview
-from schedule_manager.scheduler import Scheduler
-from schedule_manager.reporting import generate_html_report
+from schedule_manager.data_manager import DataManager
+from schedule_manager.scheduler import SolverSettings
+from schedule_manager.engines import AUTO, ENGINES
+from schedule_manager.jobs import JobManager
+from schedule_manager.repository import Repository
+from schedule_manager import exporting, reporting
 from seed_data import seed
 
 PORT = 8000
 WEB_DIR = os.path.join(os.path.dirname(__file__), 'web')
 
+# Parsed data shared by all request threads (reloaded when the files change)
+REPOSITORY = Repository()
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    # Created on first use so worker processes importing this module don't start one
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+    return _job_manager
+
+class ChunkedWriter:
+    """
+    Text sink that streams to an HTTP/1.1 response with chunked transfer
+    encoding, buffering small writes into chunks of ~64 KB.
+    """
+
+    def __init__(self, wfile, chunk_size: int = 64 * 1024):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self.buffer = []
+        self.buffered = 0
+
+    def write(self, text: str):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        data = "".join(self.buffer).encode('utf-8')
+        self.buffer, self.buffered = [], 0
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+
+    def close(self):
+        self.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+class ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
 class InterviewRequestHandler(http.server.SimpleHTTPRequestHandler):
-    
+    # HTTP/1.1 for chunked streaming responses; every other response sets Content-Length
+    protocol_version = "HTTP/1.1"
+
     def do_GET(self):
         # API Endpoints
         if self.path.startswith('/api/export/'):
             self.handle_api_export()
             return
+        if self.path.startswith('/api/report/'):
+            self.handle_api_report()
+            return
+        if self.path.startswith('/api/jobs/') and urlparse(self.path).path.endswith('/events'):
+            self.handle_job_events()
+            return
         if self.path.startswith('/api/'):
             self.handle_api_get()
             return
@@ -33,7 +91,6 @@ class InterviewRequestHandler(http.server.SimpleHTTPRequestHandler):
         return super().do_GET()
 
     def handle_api_export(self):
-        dm = DataManager()
         parsed = urlparse(self.path)
         path_parts = parsed.path.split('/')
         # /api/export/[type]/[id?]
@@ -41,86 +98,96 @@ class InterviewRequestHandler(http.server.SimpleHTTPRequestHandler):
         export_type = path_parts[3] if len(path_parts) > 3 else None
         target_id = path_parts[4] if len(path_parts) > 4 else None
         
-        # Load Data
-        companies = {c.id: c for c in dm.load_companies()}
-        students = {s.id: s for s in dm.load_students()}
-        
-        schedule_path = "schedule_manager/data/schedule.json"
-        interviews = []
-        if os.path.exists(schedule_path):
-            with open(schedule_path, 'r') as f:
-                data = json.load(f)
-                interviews = [Interview(**i) for i in data]
-
-        csv_content = ""
+        # Data and prebuilt interview indexes come from memory (single
+        # schedules from indexed queries on SQLite)
+        companies = REPOSITORY.companies_by_id()
+
         filename = "export.csv"
+        write = None
         
         if export_type == "companies":
-            csv_content = "Company ID,Company Name,Time,Student ID,Student Name,Role\n"
             filename = "all_companies_schedule.csv"
-            
-            # Sort by Company then Time
-            interviews.sort(key=lambda x: (x.company_id, x.start_time))
-            
-            for i in interviews:
-                c = companies.get(i.company_id)
-                s = students.get(i.student_id)
-                c_name = c.name if c else i.company_id
-                s_name = s.name if s else i.student_id
-                time_str = i.start_time.split('T')[1][:5]
-                
-                csv_content += f"{i.company_id},{c_name},{time_str},{i.student_id},{s_name},{i.job_role_id}\n"
+            interviews = REPOSITORY.interviews_sorted_by_company()
+            students = REPOSITORY.students_by_id()
+            write = lambda out: exporting.write_companies_csv(out, interviews, students, companies)
 
         elif export_type == "students":
-            csv_content = "Student ID,Student Name,Time,Company,Role\n"
             filename = "all_students_schedule.csv"
-            
-            interviews.sort(key=lambda x: (x.student_id, x.start_time))
-            
-            for i in interviews:
-                c = companies.get(i.company_id)
-                s = students.get(i.student_id)
-                c_name = c.name if c else i.company_id
-                s_name = s.name if s else i.student_id
-                time_str = i.start_time.split('T')[1][:5]
-                
-                csv_content += f"{i.student_id},{s_name},{time_str},{c_name},{i.job_role_id}\n"
+            interviews = REPOSITORY.interviews_sorted_by_student()
+            students = REPOSITORY.students_by_id()
+            write = lambda out: exporting.write_students_csv(out, interviews, students, companies)
                 
         elif export_type == "company" and target_id:
-            c = companies.get(target_id)
-            c_name = c.name if c else target_id
             filename = f"schedule_{target_id}.csv"
-            csv_content = f"Schedule for {c_name}\nTime,Student ID,Student Name,Role\n"
-            
-            company_interviews = [i for i in interviews if i.company_id == target_id]
-            company_interviews.sort(key=lambda x: x.start_time)
-            
-            for i in company_interviews:
-                s = students.get(i.student_id)
-                s_name = s.name if s else i.student_id
-                time_str = i.start_time.split('T')[1][:5]
-                csv_content += f"{time_str},{i.student_id},{s_name},{i.job_role_id}\n"
+            interviews, students = REPOSITORY.company_schedule(target_id)
+            write = lambda out: exporting.write_company_csv(out, target_id, interviews, students, companies)
 
         elif export_type == "student" and target_id:
-            s = students.get(target_id)
-            s_name = s.name if s else target_id
             filename = f"schedule_{target_id}.csv"
-            csv_content = f"Schedule for {s_name}\nTime,Company,Role\n"
-            
-            student_interviews = [i for i in interviews if i.student_id == target_id]
-            student_interviews.sort(key=lambda x: x.start_time)
-            
-            for i in student_interviews:
-                c = companies.get(i.company_id)
-                c_name = c.name if c else i.company_id
-                time_str = i.start_time.split('T')[1][:5]
-                csv_content += f"{time_str},{c_name},{i.job_role_id}\n"
+            interviews, students = REPOSITORY.student_schedule(target_id)
+            write = lambda out: exporting.write_student_csv(out, target_id, interviews, students, companies)
 
         self.send_response(200)
-        self.send_header('Content-type', 'text/csv')
+        self.send_header('Content-type', 'text/csv; charset=utf-8')
         self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('Transfer-Encoding', 'chunked')
         self.end_headers()
-        self.wfile.write(csv_content.encode('utf-8'))
+        out = ChunkedWriter(self.wfile)
+        if write:
+            write(out)
+        out.close()
+
+    def handle_api_report(self):
+        # /api/report/[companies|students] - HTML report streamed from memory
+        report_type = urlparse(self.path).path.split('/')[3]
+        renderers = {
+            "companies": reporting.render_html_report,
+            "students": reporting.render_student_html_report,
+        }
+        if report_type not in renderers:
+            self.send_error(404, "Unknown report")
+            return
+
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        out = ChunkedWriter(self.wfile)
+        renderers[report_type](out, REPOSITORY.interviews(), REPOSITORY.students(), REPOSITORY.companies())
+        out.close()
+
+    def handle_job_events(self):
+        # /api/jobs/<id>/events - server-sent events: one "progress" event per
+        # solver update (objective, bound, gap, wall time), then "done" or "failed"
+        job_id = urlparse(self.path).path.split('/')[3]
+        jobs = get_job_manager()
+        if jobs.get(job_id) is None:
+            self.send_error(404, "Unknown job")
+            return
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        cursor = 0
+        try:
+            while True:
+                events, finished = jobs.wait_events(job_id, cursor)
+                cursor += len(events)
+                out = [f"event: progress\ndata: {json.dumps(e)}\n\n" for e in events]
+                if finished is not None:
+                    out.append(f"event: {finished['status']}\ndata: {json.dumps(finished)}\n\n")
+                elif not events:
+                    out.append(": keep-alive\n\n")
+                self.wfile.write("".join(out).encode('utf-8'))
+                self.wfile.flush()
+                if finished is not None:
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            # The dashboard closed the stream
+            return
 
     def do_POST(self):
         if self.path.startswith('/api/'):
@@ -129,74 +196,119 @@ class InterviewRequestHandler(http.server.SimpleHTTPRequestHandler):
             self.send_error(404)
 
     def handle_api_get(self):
-        dm = DataManager()
         parsed_path = urlparse(self.path)
         
         response_data = {}
         
-        if parsed_path.path == '/api/companies':
-            companies = dm.load_companies()
-            # We also want the interviews to show schedule
-            # Ideally we have a better data structure, but for now:
-            # We can load the schedule.json if it exists
-            # Or we can just return companies and let frontend fetch schedule separately
-            response_data = [asdict(c) for c in companies]
-            
-        elif parsed_path.path == '/api/students':
-            students = dm.load_students()
-            response_data = [asdict(s) for s in students]
-            
-        elif parsed_path.path == '/api/schedule':
-            interviews = []
-            schedule_path = "schedule_manager/data/schedule.json"
-            if os.path.exists(schedule_path):
-                with open(schedule_path, 'r') as f:
-                    interviews = json.load(f)
-            response_data = interviews
+        # Data endpoints are served straight from the in-memory repository
+        cached = {
+            '/api/companies': 'companies',
+            '/api/students': 'students',
+            '/api/schedule': 'schedule',
+            # Solver settings and achieved gap of the run that produced the schedule
+            '/api/schedule/meta': 'schedule_meta',
+            # Best schedule found so far by the running (or last) solve
+            '/api/schedule/best': 'best_schedule',
+            # Per-phase timings/memory and engine statistics of that run
+            '/api/schedule/profile': 'profile',
+        }
+        if parsed_path.path in cached:
+            self.send_json_bytes(REPOSITORY.json_bytes(cached[parsed_path.path]))
+            return
+
+        if parsed_path.path == '/api/engines':
+            response_data = [
+                {"name": e.name, "description": e.description, "exact": e.exact, "available": e.available()}
+                for e in ENGINES.values()
+            ]
+
+        elif parsed_path.path == '/api/jobs':
+            response_data = get_job_manager().list()
+
+        elif parsed_path.path.startswith('/api/jobs/'):
+            job = get_job_manager().get(parsed_path.path.split('/')[3])
+            if job is None:
+                self.send_error(404, "Unknown job")
+                return
+            response_data = job
 
         self.send_json(response_data)
 
     def handle_api_post(self):
-        dm = DataManager()
         parsed_path = urlparse(self.path)
         
         response_data = {"status": "success"}
         
         if parsed_path.path == '/api/init':
             seed()
+            REPOSITORY.invalidate()
             response_data["message"] = "Data reset to seed values."
             
         elif parsed_path.path == '/api/run-schedule':
+            # The solve runs in a background worker; poll /api/jobs/<id> or stream
+            # /api/jobs/<id>/events for progress, POST /api/jobs/<id>/accept to stop early.
+            # Optional JSON body: engine ("auto" or a registered engine),
+            # max_time_in_seconds, num_search_workers, relative_gap_limit, random_seed,
+            # profile (true: also trace memory per phase), cache (false: always
+            # re-solve). The finished job's result carries the run summary
+            # including its "profile"; its "cached" is true when an identical
+            # input was served from the result cache without solving.
             try:
-                # The Scheduler now uses OR-Tools internally if available
-                from schedule_manager.scheduler import Scheduler
-                scheduler = Scheduler(dm)
-                interviews = scheduler.run("2024-10-25")
-                
-                # Check how many were scheduled to guess if it worked well
-                msg = f"Scheduled {len(interviews)} interviews."
-                if hasattr(scheduler, 'ORTOOLS_AVAILABLE') and not scheduler.ORTOOLS_AVAILABLE:
-                     msg += " (Warning: OR-Tools not found, optimization disabled)"
-                
-                response_data["message"] = msg
-                response_data["count"] = len(interviews)
-
-                # Save schedule
-                with open("schedule_manager/data/schedule.json", "w") as f:
-                    json.dump([asdict(i) for i in interviews], f, indent=2)
+                params = self.read_json_body()
+            except ValueError as e:
+                self.send_error(400, f"Malformed JSON body: {e}")
+                return
+            engine = params.get("engine", AUTO)
+            if engine != AUTO and engine not in ENGINES:
+                self.send_error(400, f"Unknown engine '{engine}'")
+                return
+            if engine != AUTO and not ENGINES[engine].available():
+                self.send_error(400, f"The {engine} engine is not available on this server (OR-Tools not installed?)")
+                return
+            try:
+                # Parsed again in the worker; checked here so bad values fail the request, not the job
+                SolverSettings.from_dict(params)
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
+            job = get_job_manager().submit(params)
+            response_data["status"] = "accepted"
+            response_data["job_id"] = job["id"]
+            response_data["job"] = job
+            response_data["message"] = "Scheduling job already running." if job["coalesced"] else "Scheduling job started."
 
-            except Exception as e:
-                print(f"Error running scheduler: {e}")
-                response_data["status"] = "error"
-                response_data["message"] = str(e)
+        elif parsed_path.path.startswith('/api/jobs/') and parsed_path.path.endswith('/accept'):
+            # Accept the best schedule found so far: the solver stops and saves it
+            try:
+                job = get_job_manager().accept(parsed_path.path.split('/')[3])
+            except ValueError as e:
+                self.send_error(409, str(e))
+                return
+            if job is None:
+                self.send_error(404, "Unknown job")
+                return
+            response_data["job"] = job
+            response_data["message"] = "Stopping the search; the best schedule so far will be saved."
 
         self.send_json(response_data)
 
+    def read_json_body(self):
+        """The request's JSON object ({} if there is none); raises ValueError if it is malformed."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        body = json.loads(self.rfile.read(length) or b'{}')
+        return body if isinstance(body, dict) else {}
+
     def send_json(self, data):
+        self.send_json_bytes(json.dumps(data).encode('utf-8'))
+
+    def send_json_bytes(self, body: bytes):
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
 
 if __name__ == "__main__":
     # Ensure data directory exists
@@ -205,10 +317,8 @@ if __name__ == "__main__":
     print(f"Starting Web Server at http://localhost:{PORT}")
     print("Press Ctrl+C to stop.")
     
-    # Allow address reuse
-    socketserver.TCPServer.allow_reuse_address = True
-    
-    with socketserver.TCPServer(("", PORT), InterviewRequestHandler) as httpd:
+    # One thread per request, so a slow export doesn't stall the dashboard
+    with ThreadingServer(("", PORT), InterviewRequestHandler) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt: